@@ -5,6 +5,7 @@ import time  # To introduce delays between sending emails (rate limiting)
 import os  # For interacting with the file system (checking if files exist)
 from datetime import datetime, timedelta  # For working with dates and times (tracking when emails were sent)
 import logging  # For logging errors to a file
+import itertools  # For splitting the emails to send into batches
 
 # Setup logging to capture any errors that occur during the script's execution
 logging.basicConfig(filename='email_errors.log', level=logging.ERROR, format='%(asctime)s %(message)s')
@@ -20,54 +21,110 @@ sent_emails_file = "sent_emails.txt"  # Tracks emails to avoid duplicates
 confirmation_file = "email_confirmation_list.txt"  # Lists emails for manual review before sending
 
 # Set the time delay (in seconds) between sending individual emails to avoid being flagged as spam
-PAUSE_TIME = 3  # Wait 3 seconds between sending emails
+PAUSE_TIME = 3  # Start sending an email every 3 seconds
 # Set the batch size for emails to send before taking a longer break
 BATCH_SIZE = 50  # Send 50 emails, then pause for a longer duration
+BATCH_PAUSE_TIME = 60  # Wait 60 seconds after a batch finishes before starting the next one
+
+# Rewrite the sent emails log without old entries once it grows past either of these limits
+SENT_LOG_MAX_ENTRIES = 10_000  # Number of distinct emails in the log
+SENT_LOG_MAX_BYTES = 1 << 20  # Size of the log file (1 MiB)
+
+# Compile the patterns used to clean email addresses once, since clean_email runs for every CSV row
+SVC_SUFFIX_PATTERN = re.compile(r',\s*SVC$', re.IGNORECASE)  # Matches ', SVC' at the end (case-insensitive)
+TRAILING_DIGITS_PATTERN = re.compile(r'\d+$')  # Matches any trailing numbers
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")  # Matches a basic email pattern
 
 def clean_email(email):
     """
     Cleans email addresses by removing unwanted characters, patterns, or formats.
     """
-    email = email.strip()  # Remove leading and trailing spaces
-    email = re.sub(r',\s*SVC$', '', email, flags=re.IGNORECASE)  # Remove ', SVC' at the end (case-insensitive)
-    email = email.rstrip(',')  # Remove any trailing commas
-    email = re.sub(r'\d+$', '', email)  # Remove any trailing numbers
-    # Check if the email contains '@' and matches a basic email pattern
-    if '@' not in email or not re.match(r"[^@]+@[^@]+\.[^@]+", email):
+    email = email.strip()  # Remove any surrounding spaces
+    # Most addresses are already clean: with no comma there is no ', SVC' or trailing comma,
+    # and ending in a letter means there are no trailing numbers, so only validation is needed
+    if email and email[-1].isalpha() and ',' not in email:
+        return email if EMAIL_PATTERN.match(email) else None
+    email = SVC_SUFFIX_PATTERN.sub('', email).rstrip(',')  # Remove ', SVC' and trailing commas
+    email = TRAILING_DIGITS_PATTERN.sub('', email)  # Remove any trailing numbers
+    # Check the email matches a basic email pattern (which also requires an '@')
+    if not EMAIL_PATTERN.match(email):
         return None  # Return None if email is invalid
     return email  # Return the cleaned email
 
-def send_email_via_macos_mail(name, email, subject, body):
-    """
-    Sends an email via macOS Mail using AppleScript.
-    """
-    email = clean_email(email)  # Ensure the email is cleaned before sending
-    if not email:  # Skip sending if the email is invalid
-        logging.error(f"Invalid email address for {name}: {email}")  # Log the error
-        return
+# AppleScript that sends every message in a batch via the Mail app, starting one every PAUSE_TIME
+# seconds (not pausing after the last one, since the batch pause follows it). The pause is counted
+# from when each message starts sending, using Foundation's clock (AppleScript's own clock only has
+# whole seconds), so the time Mail takes to send a message is not added to it. The messages are passed as
+# arguments in (subject, body, address) triples, so their text never needs escaping, and a
+# failed message is logged to stderr as 'address: error'
+SEND_EMAILS_SCRIPT = f'''
+use framework "Foundation"
+use scripting additions
 
-    # Create the AppleScript to send the email
-    applescript = f'''
+on run argv
     tell application "Mail"
-        set newMessage to make new outgoing message with properties {{subject:"{subject}", content:"{body}", visible:true}}
-        tell newMessage
-            make new to recipient at end of to recipients with properties {{address:"{email}"}}
-            send
-        end tell
+        repeat with i from 1 to (count of argv) by 3
+            if i > 1 then
+                -- Only wait for whatever is left of the pause after the time the last message took to send
+                set remainingPause to nextSendAt - (current application's NSDate's timeIntervalSinceReferenceDate())
+                if remainingPause > 0 then delay remainingPause
+            end if
+            set nextSendAt to (current application's NSDate's timeIntervalSinceReferenceDate()) + {PAUSE_TIME}
+            set msgAddress to item (i + 2) of argv
+            try
+                set newMessage to make new outgoing message with properties {{subject:(item i of argv), content:(item (i + 1) of argv), visible:true}}
+                tell newMessage
+                    make new to recipient at end of to recipients with properties {{address:msgAddress}}
+                    send
+                end tell
+            on error errMsg
+                log msgAddress & ": " & errMsg
+            end try
+        end repeat
     end tell
-    '''
-    # Run the AppleScript using the subprocess module
-    process = subprocess.run(['osascript', '-e', applescript], capture_output=True)
-    
-    if process.returncode == 0:  # Check if the AppleScript ran successfully
-        print(f"Email successfully sent to {email}")  # Notify success
-    else:  # Log and print an error if the script failed
-        logging.error(f"Failed to send email to {email}. Error: {process.stderr.decode('utf-8')}")
-        print(f"Failed to send email to {email}.")
+end run
+'''
+
+def send_emails_batch(records):
+    """
+    Sends a batch of emails via macOS Mail using a single AppleScript invocation.
+    The email addresses must already be cleaned, as prepare_email_confirmation_list does.
+    Returns the list of email addresses that were sent successfully.
+    """
+    arguments = []  # Flat (subject, body, address) triples passed to the AppleScript
+    addresses = []  # Addresses in the batch, used to attribute failures
+    for name, email, subject, body in records:  # Add one triple per recipient
+        arguments += (subject, body, email)  # Passed as-is, so quotes in names or templates cannot break the script
+        addresses.append(email)  # Remember the address so failures can be matched back to it
+
+    # Run the AppleScript for the whole batch using the subprocess module
+    process = subprocess.run(['osascript', '-e', SEND_EMAILS_SCRIPT, *arguments], capture_output=True)
+    stderr = process.stderr.decode('utf-8')  # Decode the error output once for the whole batch
+
+    if process.returncode != 0:  # The script itself failed, so none of the batch was sent
+        logging.error(f"Failed to send batch of {len(addresses)} emails. Error: {stderr}")
+        print(f"Failed to send batch of {len(addresses)} emails.")
+        return []
+
+    failed = {}  # Map each failed address to the error Mail reported for it
+    for line in stderr.splitlines():  # Each logged failure is written as 'address: error'
+        address, _, error = line.partition(': ')  # Split the address from the error message
+        if address in addresses:  # Ignore any output that is not a failure we logged
+            failed[address] = error
+    sent = []  # Addresses Mail accepted without error
+    for email in addresses:  # Report the outcome for each recipient
+        if email in failed:  # Log and print an error if Mail rejected this message
+            logging.error(f"Failed to send email to {email}. Error: {failed[email]}")
+            print(f"Failed to send email to {email}.")
+        else:
+            print(f"Email successfully sent to {email}")  # Notify success
+            sent.append(email)  # Add to the list of successfully sent emails
+    return sent  # Return the addresses that were sent
 
 def read_email_template(file_path):
     """
     Reads an email template from a file and validates its content.
+    Returns the template split around its {name} placeholders, so each email body is built with a single join.
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as template_file:  # Open the template file
@@ -77,7 +134,7 @@ def read_email_template(file_path):
                 logging.error(f"Template {file_path} is missing the required placeholder {{name}}.")  # Log the error
                 print(f"Error: The email template {file_path} is missing the required {{name}} placeholder.")  # Notify the user
                 return None
-            return template  # Return the template content if valid
+            return template.split('{name}')  # Return the text around each placeholder if valid
     except FileNotFoundError:  # Handle missing file errors
         logging.error(f"Email template file {file_path} was not found.")  # Log the error
         print(f"Error: The email template file {file_path} was not found.")  # Notify the user
@@ -102,106 +159,156 @@ def load_sent_emails(file_path):
     """
     sent_emails = {}  # Dictionary to store emails and their last sent date
     if os.path.exists(file_path):  # Check if the file exists
-        with open(file_path, 'r', encoding='utf-8') as file:  # Open the file
+        # Open the file with a large read buffer, since the log grows with every email sent
+        with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as file:
             for line in file:  # Read each line in the file
-                parts = line.strip().split(',')  # Split the line into email and timestamp
-                if len(parts) == 2:  # Ensure the line contains both email and timestamp
-                    email, timestamp = parts
-                    email = clean_email(email)  # Clean the email
-                    if email:  # If email is valid
-                        try:
-                            sent_emails[email] = datetime.strptime(timestamp, "%Y-%m-%d")  # Parse the timestamp
-                        except ValueError:  # Handle invalid timestamp formats
-                            logging.error(f"Invalid date format in sent_emails.txt for {email}. Skipping entry.")
-                else:  # Log if the line format is incorrect
+                # Entries are written by SentLog, so the email is already clean and is not re-validated
+                try:
+                    email, timestamp = line.rstrip().rsplit(',', 1)  # Split the line into email and timestamp
+                    sent_emails[email] = datetime.fromisoformat(timestamp)  # Parse the YYYY-MM-DD timestamp
+                except ValueError:  # Handle a missing separator or an invalid date format
                     logging.error(f"Incorrect format in sent_emails.txt: {line}. Skipping entry.")
     return sent_emails  # Return the dictionary of sent emails
 
-def save_sent_email(file_path, email):
+def compact_sent_emails(file_path, sent_emails, cutoff):
     """
-    Saves a newly sent email to the log file.
+    Rewrites the sent emails log with only the emails sent after the cutoff, once the log grows too large.
+    Older entries can no longer stop an email from being sent, so they only slow down loading the log.
     """
-    email = clean_email(email)  # Ensure the email is cleaned
-    if not email:  # Skip saving if the email is invalid
-        logging.error(f"Attempted to save invalid email: {email}")  # Log the error
+    if not os.path.exists(file_path):  # Nothing to compact before the first email is sent
         return
-    with open(file_path, 'a', encoding='utf-8') as file:  # Open the file in append mode
-        file.write(f"{email},{datetime.now().strftime('%Y-%m-%d')}\n")  # Append the email and timestamp
+    if len(sent_emails) <= SENT_LOG_MAX_ENTRIES and os.path.getsize(file_path) <= SENT_LOG_MAX_BYTES:
+        return  # The log is still small enough to load quickly
+    temp_path = file_path + '.tmp'  # Write the compacted log to a temporary file first
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        file.writelines(  # Keep the last sent date of each email that is still within the cutoff
+            f"{email},{sent_date.date()}\n" for email, sent_date in sent_emails.items() if sent_date > cutoff
+        )
+    os.replace(temp_path, file_path)  # Swap in the compacted log in one step, so the log is never left half written
+
+class SentLog:
+    """
+    Keeps the sent emails log file open while emails are sent, so each email is appended without reopening it.
+    """
+    def __init__(self, file_path, sent_date):
+        self.file_path = file_path  # Path to the sent emails log file
+        self.sent_date = sent_date  # Date recorded against every email, formatted as YYYY-MM-DD
+        self.file = None  # File handle, opened when the log is entered
+
+    def __enter__(self):
+        self.file = open(self.file_path, 'a', encoding='utf-8')  # Open the file once in append mode
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()  # Close the file, writing out anything still buffered
+
+    def append(self, email):
+        """
+        Saves a newly sent email to the log file.
+        The email must already be cleaned, as it is when it comes from send_emails_batch.
+        """
+        self.file.write(f"{email},{self.sent_date}\n")  # Append the email and timestamp
+
+    def flush(self):
+        """
+        Writes any buffered entries to disk.
+        """
+        self.file.flush()
 
 def prepare_email_confirmation_list(csv_file):
     """
     Generates a list of emails for review before sending them.
+    Returns the list of (name, email) pairs so the CSV only needs to be read once.
+    Each email appears only once; if it is repeated in the CSV, the last customer name is used.
     """
-    email_list = []  # List to store prepared emails
+    email_map = {}  # Maps each prepared email to its customer name, dropping duplicate emails
     with open(csv_file, newline='', encoding='utf-8') as file:  # Open the CSV file
-        reader = csv.DictReader(file)  # Read the CSV data as a dictionary
+        reader = csv.reader(file)  # Read the CSV data as plain rows (cheaper than building a dictionary per row)
+        header = next(reader, [])  # Read the header row
+        for column in ('Customer', 'Hook In, Out'):  # Check the expected columns are present
+            if column not in header:
+                raise KeyError(column)  # Report the missing column to the caller
+        name_index = header.index('Customer')  # Look up the column positions once
+        email_index = header.index('Hook In, Out')
+        row_length = max(name_index, email_index) + 1  # Shortest row that contains both columns
         for row in reader:  # Process each row
-            name = row.get('Customer', '').strip()  # Get and clean the customer name
-            email = clean_email(row.get('Hook In, Out', '').strip())  # Get and clean the email
+            if len(row) < row_length:  # Skip blank or incomplete rows
+                continue
+            name = row[name_index].strip()  # Get and clean the customer name
+            email = clean_email(row[email_index])  # Get and clean the email
             if email:  # If the email is valid
-                email_list.append((name, email))  # Add the email and name to the list
+                email_map[email] = name  # Add the email and name, replacing any earlier row for the same email
+            else:  # Log invalid emails so they can be followed up
+                logging.error(f"Skipping {name} due to invalid email: {email}")
 
+    email_list = [(name, email) for email, name in email_map.items()]  # List of unique prepared emails
     with open(confirmation_file, 'w', encoding='utf-8') as file:  # Open the confirmation file for writing
-        for name, email in email_list:  # Write each email and name to the file
-            file.write(f"{name}, {email}\n")
+        file.writelines(f"{name}, {email}\n" for name, email in email_list)  # Write each email and name to the file
     
     print(f"Email confirmation list saved to {confirmation_file}. Please review and confirm before sending emails.")
+    return email_list  # Return the prepared emails for sending
+
+def build_emails(email_list, sent_emails, cutoff, template_parts):
+    """
+    Yields the (name, email, subject, body) of each email to send, skipping customers emailed since the cutoff.
+    """
+    for name, email in email_list:  # Process each cleaned email read from the CSV
+        last_sent_date = sent_emails.get(email)  # Check the last sent date for this email
+        if last_sent_date and last_sent_date > cutoff:  # Skip if sent recently
+            continue
+        subject = f"Hello {name}"  # Create the email subject
+        body = name.join(template_parts)  # Customize the email body by inserting the name at each placeholder
+        yield name, email, subject, body
+
+def record_sent_batch(sent_batch, sent_log):
+    """
+    Records every address in a batch that was sent successfully.
+    """
+    for email in sent_batch:  # Process each address the AppleScript run sent
+        sent_log.append(email)  # Log the sent email
+    sent_log.flush()  # Write the batch's entries to disk once the batch is done
 
 def send_emails_from_csv(csv_file):
     """
     Main function that orchestrates the email sending process from the CSV file.
     """
-    prepare_email_confirmation_list(csv_file)  # Generate the email confirmation list
+    try:
+        email_list = prepare_email_confirmation_list(csv_file)  # Read the CSV and generate the email confirmation list
+    except FileNotFoundError:  # Handle missing file errors
+        logging.error(f"Error: The file {csv_file} was not found.")
+        print(f"Error: The file {csv_file} was not found.")
+        return
+    except KeyError as e:  # Handle missing columns in the CSV file
+        logging.error(f"Missing expected column {str(e)} in the CSV file.")
+        print(f"Error: Missing expected column {str(e)} in the CSV file.")
+        return
+
     confirm = input("Do you want to proceed with sending emails? (y/n): ").strip().lower()  # Ask for confirmation
     if confirm != 'y':  # Cancel if the user does not confirm
         print("Email sending canceled.")  # Notify the user
         return
     
     email_template_file = select_email_template()  # Select the appropriate email template
-    email_template = read_email_template(email_template_file)  # Read the selected template
+    template_parts = read_email_template(email_template_file)  # Read the selected template
     
-    if email_template is None:  # If the template is invalid, stop execution
+    if template_parts is None:  # If the template is invalid, stop execution
         return
 
     sent_emails = load_sent_emails(sent_emails_file)  # Load the list of sent emails
+    now = datetime.now()  # Take the current time once for the whole run
+    cutoff = now - timedelta(days=30)  # Emails sent after this date are skipped
+    compact_sent_emails(sent_emails_file, sent_emails, cutoff)  # Drop old entries if the log has grown too large
+    emails = build_emails(email_list, sent_emails, cutoff, template_parts)  # Emails still to be sent
+    # Keep the sent emails log open while sending
+    with SentLog(sent_emails_file, now.strftime('%Y-%m-%d')) as sent_log:
+        first_batch = True  # No pause is needed before the first batch
 
-    try:
-        with open(csv_file, newline='', encoding='utf-8') as file:  # Open the CSV file
-            reader = csv.DictReader(file)  # Read the CSV data as a dictionary
-            processed = 0  # Counter for processed emails
-
-            for row in reader:  # Process each row in the CSV
-                name = row.get('Customer', '').strip()  # Extract and clean the customer name
-                email = clean_email(row.get('Hook In, Out', '').strip())  # Extract and clean the email
-                
-                if not email:  # Skip invalid emails
-                    logging.error(f"Skipping {name} due to invalid email: {email}")
-                    continue
-                
-                last_sent_date = sent_emails.get(email)  # Check the last sent date for this email
-                if last_sent_date and last_sent_date > datetime.now() - timedelta(days=30):  # Skip if sent recently
-                    continue
-                
-                subject = f"Hello {name}"  # Create the email subject
-                body = email_template.format(name=name)  # Customize the email body with the name
-                
-                send_email_via_macos_mail(name, email, subject, body)  # Send the email
-                save_sent_email(sent_emails_file, email)  # Log the sent email
-                sent_emails[email] = datetime.now()  # Update the sent emails list
-
-                processed += 1  # Increment the processed counter
-                if processed % BATCH_SIZE == 0:  # If a batch is complete
-                    print("Batch complete, taking a break to avoid triggering spam filters.")  # Notify the user
-                    time.sleep(60)  # Pause for 60 seconds
-                
-                time.sleep(PAUSE_TIME)  # Pause between emails
-
-    except FileNotFoundError:  # Handle missing file errors
-        logging.error(f"Error: The file {csv_file} was not found.")
-        print(f"Error: The file {csv_file} was not found.")
-    except KeyError as e:  # Handle missing columns in the CSV file
-        logging.error(f"Missing expected column {str(e)} in the CSV file.")
-        print(f"Error: Missing expected column {str(e)} in the CSV file.")
+        while batch := list(itertools.islice(emails, BATCH_SIZE)):  # Take the next batch of emails to send
+            if not first_batch:  # If a batch has already been sent
+                print("Batch complete, taking a break to avoid triggering spam filters.")  # Notify the user
+                time.sleep(BATCH_PAUSE_TIME)  # Pause between batches to avoid spam filters
+            first_batch = False
+            record_sent_batch(send_emails_batch(batch), sent_log)  # Send the batch and log the sent emails
 
 # Start the process by invoking the main function
 send_emails_from_csv(csv_file)
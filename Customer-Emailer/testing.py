@@ -5,6 +5,7 @@ import time  # To introduce delays between sending emails (rate limiting)
 import os  # For interacting with the file system (checking if files exist)
 from datetime import datetime, timedelta  # For working with dates and times (tracking when emails were sent)
 import logging  # For logging errors to a file
+import itertools  # For splitting the emails to send into batches
 
 # Setup logging to capture any errors that occur during the script's execution
 logging.basicConfig(filename='email_errors.log', level=logging.ERROR, format='%(asctime)s %(message)s')
@@ -17,56 +18,108 @@ sent_emails_file = "sent_emails.txt"  # File to track emails that have already b
 confirmation_file = "email_confirmation_list.txt"  # File to list all emails for confirmation
 
 # Rate limiting settings
-PAUSE_TIME = 3  # Time (in seconds) between sending individual emails
+PAUSE_TIME = 3  # Time (in seconds) between the start of one email in a batch and the start of the next
 BATCH_SIZE = 50  # Number of emails to send in each batch before pausing
+BATCH_PAUSE_TIME = 60  # Time (in seconds) between the end of one batch and the start of the next
+
+# Sent emails log limits, past which old entries are removed from it
+SENT_LOG_MAX_ENTRIES = 10_000
+SENT_LOG_MAX_BYTES = 1 << 20
+
+# Email cleaning patterns, compiled once since clean_email runs for every CSV row
+SVC_SUFFIX_PATTERN = re.compile(r',\s*SVC$', re.IGNORECASE)
+TRAILING_DIGITS_PATTERN = re.compile(r'\d+$')
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
 
 def clean_email(email):
     """
     Clean the email by removing trailing commas, numbers, 'SVC', and extra whitespace.
     """
-    # Strip whitespace
     email = email.strip()
-    # Remove trailing ', SVC' (case-insensitive)
-    email = re.sub(r',\s*SVC$', '', email, flags=re.IGNORECASE)
-    # Remove trailing commas
-    email = email.rstrip(',')
+    # Fast path: with no comma and a letter at the end there is nothing to remove, so just validate
+    if email and email[-1].isalpha() and ',' not in email:
+        return email if EMAIL_PATTERN.match(email) else None
+    # Remove trailing ', SVC' (case-insensitive) and trailing commas
+    email = SVC_SUFFIX_PATTERN.sub('', email).rstrip(',')
     # Remove trailing numbers (digits at the end)
-    email = re.sub(r'\d+$', '', email)
-    # Validate email format (basic check)
-    if '@' not in email or not re.match(r"[^@]+@[^@]+\.[^@]+", email):
+    email = TRAILING_DIGITS_PATTERN.sub('', email)
+    # Validate email format (basic check, which also requires an '@')
+    if not EMAIL_PATTERN.match(email):
         return None
     return email
 
-def send_email_via_macos_mail(name, email, subject, body):
-    """
-    Sends an email using macOS Mail via AppleScript.
-    """
-    email = clean_email(email)  # Ensure email is cleaned before sending
-    if not email:
-        logging.error(f"Invalid email address for {name}: {email}")
-        return  # Skip sending invalid emails
+# AppleScript that sends every message in a batch via the macOS Mail app, starting one message every
+# PAUSE_TIME seconds (the batch pause follows the last one). The pause is timed from when each message
+# starts sending, using Foundation's sub-second clock, so the time Mail takes to send is not added to it.
+# Messages are passed as (subject, body, address) argument triples so they never need escaping;
+# failures are logged to stderr as 'address: error'
+SEND_EMAILS_SCRIPT = f'''
+use framework "Foundation"
+use scripting additions
 
-    # Prepare an AppleScript to send an email via the macOS Mail app
-    applescript = f'''
+on run argv
     tell application "Mail"
-        set newMessage to make new outgoing message with properties {{subject:"{subject}", content:"{body}", visible:true}}
-        tell newMessage
-            make new to recipient at end of to recipients with properties {{address:"{email}"}}
-            send
-        end tell
+        repeat with i from 1 to (count of argv) by 3
+            if i > 1 then
+                -- Only wait for whatever is left of the pause after the time the last message took to send
+                set remainingPause to nextSendAt - (current application's NSDate's timeIntervalSinceReferenceDate())
+                if remainingPause > 0 then delay remainingPause
+            end if
+            set nextSendAt to (current application's NSDate's timeIntervalSinceReferenceDate()) + {PAUSE_TIME}
+            set msgAddress to item (i + 2) of argv
+            try
+                set newMessage to make new outgoing message with properties {{subject:(item i of argv), content:(item (i + 1) of argv), visible:true}}
+                tell newMessage
+                    make new to recipient at end of to recipients with properties {{address:msgAddress}}
+                    send
+                end tell
+            on error errMsg
+                log msgAddress & ": " & errMsg
+            end try
+        end repeat
     end tell
-    '''
-    process = subprocess.run(['osascript', '-e', applescript], capture_output=True)
-    
-    if process.returncode == 0:
-        print(f"Email successfully sent to {email}")
-    else:
-        logging.error(f"Failed to send email to {email}. Error: {process.stderr.decode('utf-8')}")
-        print(f"Failed to send email to {email}.")
+end run
+'''
+
+def send_emails_batch(records):
+    """
+    Sends a batch of emails using macOS Mail via a single AppleScript run.
+    Emails must already be cleaned by prepare_email_confirmation_list.
+    Returns the list of email addresses that were sent successfully.
+    """
+    arguments = []
+    addresses = []
+    for name, email, subject, body in records:
+        arguments += (subject, body, email)
+        addresses.append(email)
+
+    process = subprocess.run(['osascript', '-e', SEND_EMAILS_SCRIPT, *arguments], capture_output=True)
+    stderr = process.stderr.decode('utf-8')
+
+    if process.returncode != 0:
+        logging.error(f"Failed to send batch of {len(addresses)} emails. Error: {stderr}")
+        print(f"Failed to send batch of {len(addresses)} emails.")
+        return []
+
+    failed = {}
+    for line in stderr.splitlines():
+        address, _, error = line.partition(': ')
+        if address in addresses:
+            failed[address] = error
+    sent = []
+    for email in addresses:
+        if email in failed:
+            logging.error(f"Failed to send email to {email}. Error: {failed[email]}")
+            print(f"Failed to send email to {email}.")
+        else:
+            print(f"Email successfully sent to {email}")
+            sent.append(email)
+    return sent
 
 def read_email_template(file_path):
     """
     Read an email template and validate presence of required placeholders.
+    The template is returned split around each {name} placeholder, ready to be joined with the customer name.
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as template_file:
@@ -75,7 +128,7 @@ def read_email_template(file_path):
                 logging.error(f"Template {file_path} is missing the required placeholder {{name}}.")
                 print(f"Error: The email template {file_path} is missing the required {{name}} placeholder.")
                 return None
-            return template
+            return template.split('{name}')
     except FileNotFoundError:
         logging.error(f"Email template file {file_path} was not found.")
         print(f"Error: The email template file {file_path} was not found.")
@@ -100,106 +153,155 @@ def load_sent_emails(file_path):
     """
     sent_emails = {}
     if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as file:
+        with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as file:
             for line in file:
-                parts = line.strip().split(',')
-                if len(parts) == 2:
-                    email, timestamp = parts
-                    email = clean_email(email)  # Clean the email address
-                    if email:
-                        try:
-                            sent_emails[email] = datetime.strptime(timestamp, "%Y-%m-%d")
-                        except ValueError:
-                            logging.error(f"Invalid date format in sent_emails.txt for {email}. Skipping entry.")
-                else:
+                # Entries are written by SentLog, so they are already cleaned
+                try:
+                    email, timestamp = line.rstrip().rsplit(',', 1)
+                    sent_emails[email] = datetime.fromisoformat(timestamp)
+                except ValueError:
                     logging.error(f"Incorrect format in sent_emails.txt: {line}. Skipping entry.")
     return sent_emails
 
-def save_sent_email(file_path, email):
+def compact_sent_emails(file_path, sent_emails, cutoff):
     """
-    Save the email to the sent emails log file after cleaning.
+    Rewrite the sent emails log with only the emails sent after the cutoff once it grows too large.
     """
-    email = clean_email(email)  # Ensure email is cleaned before saving
-    if not email:
-        logging.error(f"Attempted to save invalid email: {email}")
+    if not os.path.exists(file_path):
+        return
+    if len(sent_emails) <= SENT_LOG_MAX_ENTRIES and os.path.getsize(file_path) <= SENT_LOG_MAX_BYTES:
         return
-    with open(file_path, 'a', encoding='utf-8') as file:
-        file.write(f"{email},{datetime.now().strftime('%Y-%m-%d')}\n")
+    # Older entries can no longer stop an email being sent; replace the log in one step so it is never half written
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        file.writelines(
+            f"{email},{sent_date.date()}\n" for email, sent_date in sent_emails.items() if sent_date > cutoff
+        )
+    os.replace(temp_path, file_path)
+
+class SentLog:
+    """
+    Sent emails log file that stays open while emails are being sent.
+    """
+    def __init__(self, file_path, sent_date):
+        self.file_path = file_path
+        self.sent_date = sent_date  # Date recorded against every email (YYYY-MM-DD)
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.file_path, 'a', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+
+    def append(self, email):
+        """
+        Save an already cleaned email to the sent emails log file.
+        """
+        self.file.write(f"{email},{self.sent_date}\n")
+
+    def flush(self):
+        """
+        Write any buffered entries to disk.
+        """
+        self.file.flush()
 
 def prepare_email_confirmation_list(csv_file):
     """
-    Prepare an email confirmation list from the CSV file.
+    Prepare an email confirmation list from the CSV file and return the (name, email) pairs.
+    Duplicate emails are listed once, using the last customer name seen for them.
     """
-    email_list = []
+    email_map = {}
     with open(csv_file, newline='', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
+        # Use a plain reader and look up the column positions once, rather than building a dict per row
+        reader = csv.reader(file)
+        header = next(reader, [])
+        for column in ('Customer', 'Hook In, Out'):
+            if column not in header:
+                raise KeyError(column)
+        name_index = header.index('Customer')
+        email_index = header.index('Hook In, Out')
+        row_length = max(name_index, email_index) + 1
         for row in reader:
-            name = row.get('Customer', '').strip()
-            email = clean_email(row.get('Hook In, Out', '').strip())
+            if len(row) < row_length:  # Skip blank or incomplete rows
+                continue
+            name = row[name_index].strip()
+            email = clean_email(row[email_index])
             if email:
-                email_list.append((name, email))
+                email_map[email] = name
+            else:
+                logging.error(f"Skipping {name} due to invalid email: {email}")
 
+    email_list = [(name, email) for email, name in email_map.items()]
     with open(confirmation_file, 'w', encoding='utf-8') as file:
-        for name, email in email_list:
-            file.write(f"{name}, {email}\n")
+        file.writelines(f"{name}, {email}\n" for name, email in email_list)
     
     print(f"Email confirmation list saved to {confirmation_file}. Please review and confirm before sending emails.")
+    return email_list
+
+def build_emails(email_list, sent_emails, cutoff, template_parts):
+    """
+    Yield (name, email, subject, body) for each email to send, skipping customers emailed since the cutoff.
+    """
+    for name, email in email_list:
+        last_sent_date = sent_emails.get(email)
+        if last_sent_date and last_sent_date > cutoff:
+            continue
+        subject = f"Hello {name}"
+        body = name.join(template_parts)
+        yield name, email, subject, body
+
+def record_sent_batch(sent_batch, sent_log):
+    """
+    Save every address in a batch that was sent successfully.
+    """
+    for email in sent_batch:
+        sent_log.append(email)
+    sent_log.flush()
 
 def send_emails_from_csv(csv_file):
     """
     Main function to send emails from a CSV file.
     """
-    prepare_email_confirmation_list(csv_file)
+    try:
+        # The CSV is only read once; the send loop reuses the confirmation list
+        email_list = prepare_email_confirmation_list(csv_file)
+    except FileNotFoundError:
+        logging.error(f"Error: The file {csv_file} was not found.")
+        print(f"Error: The file {csv_file} was not found.")
+        return
+    except KeyError as e:
+        logging.error(f"Missing expected column {str(e)} in the CSV file.")
+        print(f"Error: Missing expected column {str(e)} in the CSV file.")
+        return
+
     confirm = input("Do you want to proceed with sending emails? (y/n): ").strip().lower()
     if confirm != 'y':
         print("Email sending canceled.")
         return
     
     email_template_file = select_email_template()
-    email_template = read_email_template(email_template_file)
+    template_parts = read_email_template(email_template_file)
     
-    if email_template is None:
+    if template_parts is None:
         return
 
     sent_emails = load_sent_emails(sent_emails_file)
+    # Work out the current time and 30-day cutoff once rather than for every email
+    now = datetime.now()
+    cutoff = now - timedelta(days=30)
+    compact_sent_emails(sent_emails_file, sent_emails, cutoff)
+    emails = build_emails(email_list, sent_emails, cutoff, template_parts)
+    with SentLog(sent_emails_file, now.strftime('%Y-%m-%d')) as sent_log:
+        first_batch = True
 
-    try:
-        with open(csv_file, newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            processed = 0
-
-            for row in reader:
-                name = row.get('Customer', '').strip()
-                email = clean_email(row.get('Hook In, Out', '').strip())
-                
-                if not email:
-                    logging.error(f"Skipping {name} due to invalid email: {email}")
-                    continue
-                
-                last_sent_date = sent_emails.get(email)
-                if last_sent_date and last_sent_date > datetime.now() - timedelta(days=30):
-                    continue
-                
-                subject = f"Hello {name}"
-                body = email_template.format(name=name)
-                
-                send_email_via_macos_mail(name, email, subject, body)
-                save_sent_email(sent_emails_file, email)
-                sent_emails[email] = datetime.now()
-
-                processed += 1
-                if processed % BATCH_SIZE == 0:
-                    print("Batch complete, taking a break to avoid triggering spam filters.")
-                    time.sleep(60)
-                
-                time.sleep(PAUSE_TIME)
-
-    except FileNotFoundError:
-        logging.error(f"Error: The file {csv_file} was not found.")
-        print(f"Error: The file {csv_file} was not found.")
-    except KeyError as e:
-        logging.error(f"Missing expected column {str(e)} in the CSV file.")
-        print(f"Error: Missing expected column {str(e)} in the CSV file.")
+        while batch := list(itertools.islice(emails, BATCH_SIZE)):
+            if not first_batch:
+                print("Batch complete, taking a break to avoid triggering spam filters.")
+                time.sleep(BATCH_PAUSE_TIME)
+            first_batch = False
+            record_sent_batch(send_emails_batch(batch), sent_log)
 
 # Start the email sending process by reading the CSV file
 send_emails_from_csv(csv_file)
@@ -7,6 +7,9 @@ Auto-Print Monitor Script (print.py)
 This script continuously monitors a specified folder for files whose names contain certain keywords.
 When a matching file is found, it is automatically printed using either the system's default printer or
 an explicitly specified printer. After successful printing, the file is removed from the folder.
+When watchdog is installed, the folder is watched for file system events (FSEvents on macOS, inotify on
+Linux) so new files are picked up as soon as they appear. Without watchdog, Linux inotify is used directly;
+otherwise the folder is polled on a timer.
 Detailed, emoji-enhanced logging is provided throughout the process to ensure step-by-step traceability.
 
 Usage:
@@ -17,7 +20,11 @@ Usage:
 Dependencies:
     - loguru: For advanced logging with custom formatting.
     - wcwidth: To calculate the display width of Unicode strings (ensuring proper emoji alignment).
-    - Standard Python libraries: os, subprocess, time, json, sys
+    - watchdog (optional): To receive file system events instead of polling the target folder.
+    - pycups (optional): To talk to CUPS directly instead of running 'lpstat' and 'lp' for each check and job.
+    - orjson (optional): To parse the settings file faster than the json module.
+    - Standard Python libraries: os, subprocess, time, json, sys, queue, re, functools, shutil, threading,
+      ctypes, select, struct, stat, concurrent.futures, dataclasses, typing
 
 Note:
     - Extensive error handling is implemented to manage issues like file access and printer availability.
@@ -35,10 +42,66 @@ import time
 import json
 # Import the sys module for system-specific parameters and functions.
 import sys
+# Import the queue module to hand file paths from the folder watcher thread to the main loop.
+import queue
+# Import the re module to compile long keyword lists into a single pattern for matching file names.
+import re
+# Import the functools module to cache the display width of repeated log messages.
+import functools
+# Import the shutil module to find the full paths of the lpstat and lp commands.
+import shutil
+# Import the threading module to keep a separate pycups connection for each print worker thread.
+import threading
+# Import ctypes to call Linux inotify directly when watchdog is not installed.
+import ctypes
+# Import the select module to wait for inotify events without busy polling.
+import select
+# Import the struct module to decode the inotify event records.
+import struct
+# Import the stat module to check a file's type from lstat without following symbolic links.
+import stat
+# Import dataclass to hold the validated settings as a frozen object with attribute access.
+from dataclasses import dataclass
+# Import Optional to annotate the settings that may be left unset.
+from typing import Optional
+# Import ThreadPoolExecutor to submit several print jobs to CUPS at the same time, and wait to finish
+# any print jobs still running before the target folder is closed.
+from concurrent.futures import ThreadPoolExecutor, wait
 # Import the logger object from loguru for advanced logging capabilities.
 from loguru import logger
 # Import the wcswidth function from wcwidth to compute the display width of Unicode strings.
 from wcwidth import wcswidth
+try:
+    # Import the watchdog observer and event handler base class to watch the target folder for new files.
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    # Import the file event types the handler acts on, so the observer can be limited to them.
+    from watchdog.events import FileCreatedEvent, FileMovedEvent, FileClosedEvent
+except ImportError:
+    # watchdog is optional; without it the target folder is watched with inotify on Linux, or polled every scan interval.
+    Observer = None
+    FileSystemEventHandler = object
+try:
+    # Look up the inotify functions in the C library, to watch the target folder on Linux without watchdog.
+    libc = ctypes.CDLL(None, use_errno=True)
+    inotify_init1 = libc.inotify_init1
+    inotify_add_watch = libc.inotify_add_watch
+    inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+except (OSError, AttributeError):
+    # inotify is only available on Linux; elsewhere the target folder is polled if watchdog is not installed.
+    inotify_init1 = None
+try:
+    # Import pycups to check printers and submit print jobs over a connection to the CUPS server.
+    import cups
+except ImportError:
+    # pycups is optional; without it printers are checked with 'lpstat' and each print job is submitted with 'lp'.
+    cups = None
+try:
+    # Import orjson to parse the settings file with its faster JSON parser.
+    from orjson import loads as json_loads
+except ImportError:
+    # orjson is optional; without it the settings file is parsed with the json module.
+    json_loads = json.loads
 
 # Define a constant for the base length of the longest log line, used for visual formatting.
 BASE_LONGEST_LINE_LENGTH = 141
@@ -48,8 +111,109 @@ OFFSET_COMPENSATION = 2
 LONGEST_LINE_LENGTH = BASE_LONGEST_LINE_LENGTH - 13 + OFFSET_COMPENSATION
 # The above calculation sets a constant value for formatting log messages with consistent width.
 
+# Define how long (in seconds) to wait for a file system event before re-checking the printer.
+EVENT_WAIT_SECONDS = 30
+# Define the longest wait (in seconds) between scans when the folder is polled. The wait doubles from the
+# configured scan interval after each cycle that finds no files, and goes back to it once a file is found.
+MAX_IDLE_SCAN_INTERVAL_SECONDS = 60
+# Define how often (in seconds) the whole folder is scanned while it is watched, as a backstop for missed events.
+FOLDER_SWEEP_SECONDS = 60
+# Define how old (in seconds) the folder's modification time must be before it is trusted to skip a scan,
+# since on file systems with coarse timestamps a file added just after a scan could leave it unchanged.
+FOLDER_MTIME_SETTLE_SECONDS = 2
+# Define how long (in seconds) a file must go unmodified before it is treated as completely written and printed.
+FILE_SETTLE_SECONDS = 2
+# Define how long (in seconds) to keep collecting new files after the folder watcher reports one, so a burst
+# of files arriving together is printed in a single job instead of one job per file.
+PRINT_COALESCE_SECONDS = 0.5
+# Define the most files sent to the printer in a single print job, keeping the 'lp' command line and each job bounded.
+MAX_FILES_PER_PRINT_JOB = 50
+# Define how often (in seconds) the record of folder entries that are not printed is cleared, so it cannot keep growing.
+IGNORED_ENTRIES_RESET_SECONDS = 3600
+# Define the most keywords checked one at a time with a substring search; longer lists are matched with one regular expression.
+MAX_SUBSTRING_KEYWORDS = 8
+# Define how many print jobs can be submitted to CUPS at the same time.
+PRINT_WORKERS = 4
+# Define the shortest and longest waits (in seconds) before retrying after a printer or folder problem.
+# The wait doubles after each failed attempt, so short interruptions are recovered from quickly.
+RETRY_MIN_SECONDS = 0.5
+RETRY_MAX_SECONDS = 10
+# Define how long (in seconds) the printer status (from pycups or 'lpstat -t') is reused before checking it again.
+CUPS_STATUS_TTL_SECONDS = 60
+# Define how old (in seconds) the cached printer status can get before it is refreshed in the background,
+# so the main loop keeps using the cache instead of waiting for the printer check once it expires.
+CUPS_STATUS_REFRESH_SECONDS = 45
+
+# Define the inotify events reported for the target folder: a file written and closed, or moved in. A file that
+# has only just been created is not reported, as it is reported once it has been written and closed.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+# Define the inotify flag set on events for a directory rather than a file.
+IN_ISDIR = 0x40000000
+# Define the layout of the fixed part of an inotify event record: watch, mask, cookie and name length.
+INOTIFY_EVENT = struct.Struct('iIII')
+
+# Cache of the last printer status: the default printer, the available printers and the monotonic time it was checked.
+_cups_status_cache = {'default': None, 'available': frozenset(), 'checked_at': None}
+
+# Held while the printer status is being refreshed in the background, so only one refresh runs at a time.
+_cups_refresh_lock = threading.Lock()
+
+# The single background thread that refreshes the printer status. Reusing one thread means it keeps one
+# pycups connection open for every refresh, instead of connecting to the CUPS server again each time.
+_printer_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='printer-refresh')
+
+# The pycups connection to the CUPS server for each thread that uses one (the main loop, the printer refresh
+# thread and each print worker), opened on first use and reused for every later printer check and print job
+# on that thread (a pycups connection must not be shared between threads).
+_cups_connection = threading.local()
+
+# Define the path of the default settings file, "print_settings.json" in the same directory as the script.
+# It is worked out once here, since resolving the script's real path takes a system call per path component.
+DEFAULT_SETTINGS_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "print_settings.json")
+
+# Cache of the last settings loaded by load_settings_if_changed: the file's modification time and its settings.
+_settings_cache = {'mtime_ns': None, 'settings': None}
+
 # Define a static prefix example to simulate the width of the log header.
 STATIC_PREFIX = "| AUTO_PRINT | 20/3/25 11:17:00.628 | TRACE    | "  # This string is used to determine the display width for log formatting.
+# Compute the display width of the static prefix once, since it never changes.
+STATIC_PREFIX_WIDTH = wcswidth(STATIC_PREFIX)
+
+@functools.lru_cache(maxsize=2048)
+def cached_wcswidth(text):
+    """
+    Return the display width of a string from wcswidth, caching the result for repeated text.
+    
+    Args:
+        text (str): The string to measure.
+    
+    Returns:
+        int: The display width of the string, as returned by wcswidth.
+    """
+    return wcswidth(text)
+
+def display_width(text):
+    """
+    Return the display width of a log message, only using wcswidth where it is needed.
+    
+    Every ASCII character is one column wide, so ASCII text is measured with len(). Most log
+    messages are an emoji followed by ASCII text that changes from message to message (file names,
+    counts), so only the part before the first space is measured with wcswidth, and that part is
+    the same for every message of a kind, so its width comes from the cache.
+    
+    Args:
+        text (str): The string to measure.
+    
+    Returns:
+        int: The display width of the string.
+    """
+    if text.isascii():
+        return len(text)  # Every ASCII character takes one column.
+    head, separator, tail = text.partition(' ')  # Split off the emoji at the start of the message.
+    if separator and tail.isascii():
+        return cached_wcswidth(head) + 1 + len(tail)
+    return cached_wcswidth(text)  # Measure text with non-ASCII characters after the start in full.
 
 def padded_message(record):
     """
@@ -66,41 +230,95 @@ def padded_message(record):
         str: The padded message with additional spaces appended.
     """
     msg = record['message']  # Extract the log message from the record dictionary.
-    prefix_length = wcswidth(STATIC_PREFIX)  # Compute the display width of the static prefix using wcwidth.
     # Calculate the combined width of the prefix and the message (plus one extra space for separation).
-    line_length = prefix_length + wcswidth(msg + " ")
+    line_length = STATIC_PREFIX_WIDTH + display_width(msg) + 1
     # Determine how many spaces are needed to reach the longest line length, ensuring non-negative value.
     spaces_needed = max(0, LONGEST_LINE_LENGTH - line_length - 1)
     # Return the message concatenated with the necessary number of space characters.
     return f"{msg}{' ' * spaces_needed}"
 
+@dataclass(frozen=True)
+class Settings:
+    """
+    The printing settings, validated once when the settings file is loaded.
+    
+    Every field has the default used when it is missing from the settings file, so main() can read
+    the settings as attributes without checking for missing keys.
+    """
+    target_folder: str = '~/Downloads'  # The folder to watch for files to print.
+    keywords: tuple = ()  # The keywords to search for in file names.
+    use_default_printer: bool = True  # Whether to print with the system's default printer.
+    explicit_printer_name: Optional[str] = None  # The printer to use when the default printer is not used.
+    scan_interval_seconds: float = 3  # How often (in seconds) the folder is scanned when it is polled.
+    log_level: str = "TRACE"  # The lowest level of log message that is shown.
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build the settings from the dictionary read from the settings file, checking each value's type.
+        
+        Args:
+            data (dict): The settings read from the JSON settings file.
+        
+        Returns:
+            Settings: The validated settings.
+        
+        Raises:
+            ValueError: If the settings are not a JSON object or a setting has the wrong type.
+        """
+        # The top level of the settings file must be a JSON object.
+        if not isinstance(data, dict):
+            raise ValueError("the settings must be a JSON object")
+        # Start from the defaults and override them with the settings present in the file.
+        values = {**cls().__dict__, **{key: value for key, value in data.items() if key in cls.__dataclass_fields__}}
+        # Check that the folder and log level are strings.
+        for key in ('target_folder', 'log_level'):
+            if not isinstance(values[key], str):
+                raise ValueError(f"'{key}' must be a string")
+        # Check that the keywords are a list of strings, and store them as a tuple so they cannot change.
+        keywords = values['keywords']
+        if not isinstance(keywords, (list, tuple)) or not all(isinstance(keyword, str) for keyword in keywords):
+            raise ValueError("'keywords' must be a list of strings")
+        values['keywords'] = tuple(keywords)
+        # Check that use_default_printer is true or false.
+        if not isinstance(values['use_default_printer'], bool):
+            raise ValueError("'use_default_printer' must be true or false")
+        # Check that the explicit printer name is a string or null.
+        if values['explicit_printer_name'] is not None and not isinstance(values['explicit_printer_name'], str):
+            raise ValueError("'explicit_printer_name' must be a string or null")
+        # Check that the scan interval is a positive number (booleans are numbers in Python, so reject them too).
+        scan_interval = values['scan_interval_seconds']
+        if isinstance(scan_interval, bool) or not isinstance(scan_interval, (int, float)) or scan_interval <= 0:
+            raise ValueError("'scan_interval_seconds' must be a positive number")
+        # Store the log level in upper case, as expected by loguru.
+        values['log_level'] = values['log_level'].upper()
+        return cls(**values)
+
 def load_settings(settings_file=None):
     """
-    Load the printing settings from a JSON configuration file.
+    Load and validate the printing settings from a JSON configuration file.
     
     This function attempts to load a JSON file containing configuration settings. If no file path 
     is provided, it defaults to a file named "print_settings.json" in the same directory as the script.
-    It handles errors such as missing files and invalid JSON syntax.
+    It handles errors such as missing files, invalid JSON syntax and settings of the wrong type.
     
     Args:
         settings_file (str, optional): The file path to the JSON settings file. Defaults to None.
     
     Returns:
-        dict or None: The settings as a dictionary if successful; otherwise, None.
+        Settings or None: The validated settings if successful; otherwise, None.
     """
-    # If no settings file is provided, determine the default settings file location.
+    # If no settings file is provided, use the default settings file location.
     if settings_file is None:
-        # Get the directory of the current script.
-        script_dir = os.path.dirname(os.path.realpath(__file__))
-        # Set the path to the default JSON file named "print_settings.json" in the same directory.
-        settings_file = os.path.join(script_dir, "print_settings.json")
+        settings_file = DEFAULT_SETTINGS_FILE
     try:
         # Open the settings file in read mode.
-        with open(settings_file, 'r') as f:
-            # Load the JSON content from the file into a Python dictionary.
-            settings = json.load(f)
-        # Return the loaded settings dictionary.
-        return settings
+        with open(settings_file, 'rb') as f:
+            # Read the file as bytes and parse the JSON content into a Python dictionary. orjson's
+            # JSONDecodeError is a subclass of json.JSONDecodeError, so both parsers' errors are handled below.
+            settings = json_loads(f.read())
+        # Validate the settings once here, so they can be used without further checks.
+        return Settings.from_dict(settings)
     except FileNotFoundError:
         # Print an error message if the file is not found.
         print(f"❌ ERROR: Settings file not found: {settings_file}")
@@ -111,11 +329,54 @@ def load_settings(settings_file=None):
         print(f"🚫 ERROR: Invalid JSON syntax in {settings_file}")
         # Return None to indicate failure due to invalid JSON.
         return None
+    except ValueError as e:
+        # Print an error message if a setting has the wrong type.
+        print(f"🚫 ERROR: Invalid settings in {settings_file}: {e}")
+        # Return None to indicate failure due to invalid settings.
+        return None
 
-# Load settings early to determine the logging level.
-early_settings = load_settings()
+def load_settings_if_changed(settings_file=None):
+    """
+    Load the printing settings only if the settings file has changed since it was last loaded.
+    
+    The file's modification time is compared with the one recorded when it was last loaded, so
+    an unchanged file costs a single stat call instead of a read and JSON parse. If the file is
+    missing or contains invalid JSON, the last successfully loaded settings are kept.
+    
+    Args:
+        settings_file (str, optional): The file path to the JSON settings file. Defaults to None.
+    
+    Returns:
+        tuple: (settings, changed) where settings is the current Settings (or None if
+        none have ever loaded) and changed is True if new settings were loaded by this call.
+    """
+    # If no settings file is provided, use the default settings file location.
+    if settings_file is None:
+        settings_file = DEFAULT_SETTINGS_FILE
+    try:
+        # Get the modification time of the settings file in nanoseconds.
+        mtime_ns = os.stat(settings_file).st_mtime_ns
+    except OSError:
+        if _settings_cache['settings'] is not None:
+            # The file has gone missing since it was loaded, so keep using the last loaded settings.
+            return _settings_cache['settings'], False
+        mtime_ns = None  # Nothing has loaded yet, so let load_settings() report the problem.
+    if mtime_ns is not None and mtime_ns == _settings_cache['mtime_ns']:
+        # The file has not changed since it was last loaded, so return the cached settings.
+        return _settings_cache['settings'], False
+    settings = load_settings(settings_file)  # Read and parse the changed settings file.
+    _settings_cache['mtime_ns'] = mtime_ns  # Record the modification time so a bad file is not re-read every cycle.
+    if settings is None:
+        # The file could not be loaded, so keep using the last loaded settings.
+        return _settings_cache['settings'], False
+    _settings_cache['settings'] = settings  # Cache the newly loaded settings.
+    return settings, True
+
+# Load settings early to determine the logging level. Loading them through the cache means main()
+# reuses these settings with a single stat call instead of reading and parsing the file again.
+early_settings, _ = load_settings_if_changed()
 # Determine the log level from the settings, defaulting to "TRACE" if not set or if settings are missing.
-log_level = early_settings.get("log_level", "TRACE").upper() if early_settings else "TRACE"
+log_level = early_settings.log_level if early_settings else "TRACE"
 
 logger.remove()  # Remove any default logger configurations to allow custom formatting to be applied.
 
@@ -129,7 +390,9 @@ logger.add(
         "<bold><level>{level: <8}</level></bold> | {extra[padded]}"  # Format the log level and include the padded message.
     ),
     level=log_level,  # Set the logging level based on the configuration settings.
-    enqueue=True  # Enable asynchronous logging to improve performance.
+    # Write console messages directly; the volume is low, so handing each one to a queue and background
+    # thread costs more than writing it. Loguru still locks the sink, so the print threads can log safely.
+    enqueue=False
 )
 
 # Add another logger configuration to write logs to a file named "printer_monitor.log".
@@ -142,31 +405,54 @@ logger.add(
     colorize=False,  # Disable colored output for the file logs.
     level=log_level,  # Set the logging level for file logging.
     format="| AUTO_PRINT | {time:DD/M/YY HH:mm:ss.SSS} | {level: <8} | {extra[padded]}",  # Define the log format for file logs.
-    enqueue=True  # Enable asynchronous logging for file output as well.
+    # Write file messages directly as well. With enqueue=True every message was pickled and sent through a
+    # pipe to loguru's background thread, which costs the logging thread several times more than the write
+    # itself; only the rare rotation (and its zip compression) now runs on the logging thread.
+    enqueue=False
 )
 
+def add_padded_message(record):
+    """
+    Store the padded version of a log record's message for the log formats to use.
+    
+    This is installed as the logger's patcher, so it runs once for each record that is actually
+    logged, after loguru has formatted the message with its arguments.
+    
+    Args:
+        record (dict): The loguru record being logged.
+    """
+    record['extra']['padded'] = padded_message(record)  # The formats show {extra[padded]} in place of the message.
+
+# Pad every record through the patcher, rather than binding a new logger with the padded message on each call.
+logger.configure(patcher=add_padded_message)
+
 def padded_log_method(level):
     """
-    Create a wrapper for logging methods that automatically pads messages.
+    Return the logging method for a log level, whose messages are automatically padded.
     
-    This function returns a wrapper function that formats the message using the provided log level,
-    computes the padded version of the message, and then logs it using the bound logger.
+    This function returns loguru's own method for the provided log level (such as logger.info),
+    rather than a wrapper around logger.log, so each call goes straight to loguru without an extra
+    function call or level name lookup; the padding is added to each record by the
+    add_padded_message patcher, and loguru formats the message only once. Levels below
+    the configured log level get a function that does nothing, since every sink would discard them.
+    Debug and trace messages pass their values as arguments, e.g. logger.ptrace("Cycle {}", count),
+    rather than as f-strings, so a disabled message is not even formatted.
     
     Args:
         level (str): The logging level (e.g., "TRACE", "DEBUG", "INFO").
     
     Returns:
-        function: A wrapper function that logs messages with the specified level and padded formatting.
-    """
-    def wrapper(msg, *args, **kwargs):
-        # Format the message using Python's str.format() with any additional arguments.
-        formatted_message = msg.format(*args)
-        # Compute the padded version of the formatted message using the padded_message function.
-        padded = padded_message({'message': formatted_message})
-        # Bind the padded message as extra context and log the message at the specified log level.
-        logger.bind(padded=padded).log(level, msg, *args, **kwargs)
-    # Return the wrapper function so it can be used for logging.
-    return wrapper
+        function: A function that logs messages with the specified level and padded formatting.
+    """
+    if logger.level(level).no < logger.level(log_level).no:
+        def discard(msg, *args, **kwargs):
+            # The message would be filtered out, so skip formatting, padding and logging it.
+            pass
+        # Return the no-op function so disabled log calls cost as little as possible.
+        return discard
+
+    # Return loguru's method for the level; the patcher pads each message once loguru has formatted it.
+    return getattr(logger, level.lower())
 
 # Create padded log methods for various log levels and attach them as custom methods to the logger.
 logger.ptrace = padded_log_method("TRACE")       # For trace-level messages, used for detailed debugging information.
@@ -177,67 +463,716 @@ logger.pwarning = padded_log_method("WARNING")     # For warning messages about
 logger.perror = padded_log_method("ERROR")         # For error messages indicating failures.
 logger.pcritical = padded_log_method("CRITICAL")   # For critical messages indicating severe issues.
 
-def get_default_printer():
+@functools.lru_cache(maxsize=None)
+def command_path(command):
+    """
+    Return the full path of a command found on the PATH, looking it up only once.
+    
+    Args:
+        command (str): The command name, such as 'lp'.
+    
+    Returns:
+        str: The full path of the command, or the command name unchanged if it is not on the PATH.
+    """
+    return shutil.which(command) or command
+
+def run_command(args, **kwargs):
+    """
+    Run a command and capture its output as text, starting it as cheaply as possible.
+    
+    CPython starts a child process with posix_spawn() instead of fork() and exec() when it is given
+    the full path of the program and does not need to close inherited file descriptors. Python
+    opens its own files as non-inheritable, and the inotify descriptor watchdog opens is made
+    non-inheritable once the folder watcher starts, so close_fds=False does not leak any of them to the child.
+    
+    Args:
+        args (list): The command name followed by its arguments.
+        **kwargs: Further keyword arguments passed on to subprocess.run.
+    
+    Returns:
+        subprocess.CompletedProcess: The result of the command.
+    """
+    return subprocess.run(
+        [command_path(args[0]), *args[1:]], capture_output=True, text=True, close_fds=False, **kwargs
+    )
+
+def probe_cups():
+    """
+    Detect the system's default printer and the available printers, using the cached status when it is fresh.
+    
+    Returns:
+        tuple: The default printer name (or None if there is none) and a frozenset of available printer names.
+    
+    A result that found at least one printer is cached for CUPS_STATUS_TTL_SECONDS, so the printers are
+    only checked again once the cache expires or is cleared by invalidate_printer_cache(). The main loop
+    clears it after a failed print and whenever the printer it needs is missing, so only a status
+    that the printer can be used is ever trusted from the cache. Once the cached status is older than
+    CUPS_STATUS_REFRESH_SECONDS it is refreshed on a background thread, so a slow printer check (such as
+    while cupsd is busy) does not hold up scanning the folder and printing.
+    """
+    checked_at = _cups_status_cache['checked_at']  # Get when the printer status was last checked, if ever.
+    if checked_at is not None:
+        status_age = time.monotonic() - checked_at  # How long ago the cached printer status was checked.
+        if status_age < CUPS_STATUS_TTL_SECONDS:
+            if status_age >= CUPS_STATUS_REFRESH_SECONDS and _cups_refresh_lock.acquire(blocking=False):
+                # Refresh the printer status in the background before the cache expires.
+                logger.ptrace("🛠️ TRACE: Refreshing printer status in the background")
+                _printer_refresh_executor.submit(refresh_printer_status)
+            # Reuse the cached printer status while it is still fresh, avoiding a request to CUPS.
+            logger.ptrace("🛠️ TRACE: Using cached printer status")
+            return _cups_status_cache['default'], _cups_status_cache['available']
+    return check_printer_status()
+
+def check_printer_status():
+    """
+    Find the default printer and the available printers, and cache the result.
+    
+    The printers are fetched over the pycups connection when pycups is installed, saving an 'lpstat'
+    process for each check; otherwise 'lpstat -t' is run.
+    
+    Returns:
+        tuple: The default printer name (or None if there is none) and a frozenset of available printer names.
+    """
+    logger.pdebug("🔍 Checking default printer and printer availability...")  # Log a debug message indicating the printer check.
+    # Choose how to check the printers.
+    query_printers = query_cups_printers if cups is not None else query_lpstat_printers
+    default_printer, available_printers = query_printers()
+    if default_printer:
+        logger.pdebug("🖨️ Default printer detected: {}", default_printer)  # Log a debug message with the detected printer.
+    if available_printers:
+        # Cache the printer status along with the time it was checked.
+        _cups_status_cache.update(default=default_printer, available=available_printers, checked_at=time.monotonic())
+    else:
+        invalidate_printer_cache()  # Forget any earlier printer status so the next cycle checks again.
+    # Return the detected default printer and the available printers.
+    return default_printer, available_printers
+
+def query_cups_printers():
     """
-    Detect and return the system's default printer using the 'lpstat' command.
+    Get the default printer and the printers known to CUPS over the pycups connection.
     
-    This function attempts to run the 'lpstat -d' command to retrieve the default printer.
-    If successful, it extracts and returns the printer name. In case of errors or if no default 
-    printer is found, it logs a warning and returns None.
+    Returns:
+        tuple: The default printer name (or None if there is none) and a frozenset of available printer
+        names, which is empty if CUPS could not be reached.
+    """
+    try:
+        connection = get_cups_connection()  # Reuse this thread's connection to the CUPS server.
+        default_printer = connection.getDefault()  # The system default destination, or None.
+        available_printers = frozenset(connection.getPrinters())  # Every printer CUPS reports, keyed by name.
+    except (cups.IPPError, cups.HTTPError, RuntimeError) as e:
+        # If CUPS could not be reached, log an error message with the reason.
+        logger.perror(f"🚨 Exception encountered checking printers with CUPS: {e}")
+        _cups_connection.connection = None  # Reconnect for the next check, as the connection may have been lost.
+        return None, frozenset()
+    except Exception as e:
+        # If anything else goes wrong, log an error message so the main loop keeps running and retries later.
+        logger.perror(f"🚨 Exception encountered checking printers with CUPS: {e}")
+        return None, frozenset()
+    logger.ptrace("🛠️ TRACE: CUPS returned default: {}, printers: {}", default_printer, len(available_printers))
+    return default_printer, available_printers
+
+def query_lpstat_printers():
+    """
+    Get the default printer and the available printers with a single 'lpstat -t' command.
+    
+    'lpstat -t' reports both the system default destination and the status of every printer, so one
+    subprocess answers both questions. A printer counts as available when lpstat reports a status line
+    for it, matching the exit status of 'lpstat -p <printer_name>'.
     
     Returns:
-        str or None: The default printer name if detected; otherwise, None.
+        tuple: The default printer name (or None if there is none) and a frozenset of available printer names.
+    """
+    logger.ptrace("🛠️ TRACE: Running subprocess: lpstat -t")  # Log a trace message before executing the command.
+    # Execute the 'lpstat -t' command, capturing the output as text. The C locale keeps the output
+    # in English so it can be parsed regardless of the system language.
+    result = run_command(['lpstat', '-t'], env={**os.environ, 'LC_ALL': 'C'})
+    default_printer = None  # The system default printer, if one is reported.
+    available_printers = set()  # The names of all printers lpstat reports a status for.
+    for line in result.stdout.splitlines():
+        if line.startswith('system default destination: '):
+            # Extract the default printer name from the text after the ': ' separator.
+            default_printer = line.split(': ', 1)[1].strip()
+        elif line.startswith('printer '):
+            # Status lines look like 'printer <name> is idle.', 'printer <name> now printing ...' or 'printer <name> disabled ...'.
+            available_printers.add(line.split()[1])
+    available_printers = frozenset(available_printers)
+    logger.ptrace("🛠️ TRACE: lpstat returned {} — default: {}, printers: {}", result.returncode, default_printer, len(available_printers))
+    return default_printer, available_printers
+
+def refresh_printer_status():
+    """
+    Check the printer status on the background refresh thread, submitted by probe_cups() while holding _cups_refresh_lock.
+    
+    The lock is released once the check finishes, so a later probe_cups() call can start the next refresh.
     """
-    logger.pdebug("🔍 Detecting system default printer...")  # Log a debug message indicating printer detection.
-    logger.ptrace("🛠️ TRACE: Running subprocess: lpstat -d")  # Log a trace message before executing the command.
     try:
-        # Execute the 'lpstat -d' command using subprocess.run to get the default printer,
-        # capturing the output as text and raising an error if the command fails.
-        result = subprocess.run(['lpstat', '-d'], capture_output=True, text=True, check=True)
-        # Strip any extra whitespace from the output and take the first part of the output for tracing.
-        short_status = result.stdout.strip().split('.')[0]
-        logger.ptrace(f"🛠️ TRACE: lpstat OK — {short_status}")  # Log a trace message with the short status output.
-        # Extract the printer name by splitting the output string on ': ' and taking the second part.
-        printer_name = result.stdout.strip().split(': ')[1]
-        logger.psuccess(f"🖨️ Default printer detected: {printer_name}")  # Log a success message with the detected printer.
-        # Return the detected default printer name.
-        return printer_name
-    except (subprocess.CalledProcessError, IndexError):
-        # Log a warning message if the lpstat command fails or the output is not as expected.
-        logger.pwarning("⚠️ No default printer found, retrying in 10 seconds.")
-        # Return None to indicate that no default printer could be detected.
-        return None
+        check_printer_status()
+    except Exception as e:
+        # If the printers could not be checked, log an error message; the main loop checks again once the cache expires.
+        logger.perror(f"🚨 Exception encountered refreshing the printer status: {e}")
+    finally:
+        _cups_refresh_lock.release()  # Allow the next background refresh.
+
+def invalidate_printer_cache():
+    """
+    Clear the cached printer status.
+    
+    This is called after a print failure so the next cycle checks the printers again instead of
+    trusting printer information that may be out of date.
+    """
+    _cups_status_cache.update(default=None, available=frozenset(), checked_at=None)  # Forget the cached printer status.
+
+def compile_keyword_matcher(keywords):
+    """
+    Build a case-insensitive function that checks whether a file name contains one of the keywords.
+    
+    Duplicate keywords, and keywords that contain a shorter keyword (which already matches any name
+    they would match), are left out so only the keywords that can make a difference are checked.
+    For a handful of keywords the name is lowercased once and each keyword is looked for with a plain
+    substring search, which is faster in CPython than running a regular expression over every name.
+    Longer keyword lists are joined into one regular expression alternation instead, so each file
+    name is scanned once rather than once per keyword. The name is lowercased for the regular
+    expression too, rather than compiling it with re.IGNORECASE, which stops the re module from
+    using its fast literal prefix search and made matching about ten times slower.
+    
+    Args:
+        keywords (tuple): The keywords to look for in file names.
+    
+    Returns:
+        callable: A function that takes a file name and returns a true value if it contains a keyword.
+    """
+    needed_keywords = []  # The keywords left after removing duplicates and redundant longer keywords.
+    # Check the shortest keywords first, so any keyword containing one already kept can be skipped.
+    for keyword in sorted({keyword.lower() for keyword in keywords}, key=len):
+        if not any(shorter in keyword for shorter in needed_keywords):
+            needed_keywords.append(keyword)
+    if len(needed_keywords) > MAX_SUBSTRING_KEYWORDS:
+        # Escape each keyword so characters such as '.' or '(' are matched literally.
+        search_keywords = re.compile('|'.join(re.escape(keyword) for keyword in needed_keywords)).search
+
+        def matches_keyword_pattern(name):
+            # Lowercase the name once, as the keywords are already lowercase.
+            return search_keywords(name.lower())
+
+        return matches_keyword_pattern
+    needed_keywords = tuple(needed_keywords)  # A tuple is slightly faster to loop over than a list.
+
+    def matches_keyword(name):
+        name = name.lower()  # Lowercase the name once, as the keywords are already lowercase.
+        for keyword in needed_keywords:
+            if keyword in name:
+                return True
+        # With no keywords configured nothing matches.
+        return False
+
+    return matches_keyword
+
+class KeywordFileHandler(FileSystemEventHandler):
+    """
+    Watchdog event handler that queues files whose names contain one of the configured keywords.
+    
+    Files are queued when they are created in the target folder, renamed into it (browsers
+    typically download to a temporary name and rename the file once the download is complete),
+    or closed after being written (inotify's IN_CLOSE_WRITE, only reported on Linux). Each path is
+    queued with whether the event shows the file is completely written (moved in or closed after
+    writing), so the main loop does not have to wait to see whether it is still changing.
+    The handler runs on the folder watcher thread, so it only queues paths for the main loop.
+    """
+    def __init__(self, keyword_matcher, file_queue, wait_for_close=False):
+        """
+        Args:
+            keyword_matcher (callable): The function from compile_keyword_matcher that new file names are checked with.
+            file_queue (queue.Queue): The queue that (path, written) pairs for matching files are placed on.
+            wait_for_close (bool, optional): True if the observer reports files closed after writing and files
+                moved in from outside the folder as moved, so created files are left until they are closed.
+        """
+        super().__init__()
+        self.keyword_matcher = keyword_matcher  # Checks whether a file name contains one of the keywords.
+        self.file_queue = file_queue  # Queue shared with the main loop.
+        self.wait_for_close = wait_for_close  # Whether created files are reported again once they are closed.
+
+    def queue_if_matching(self, path, written):
+        """
+        Place the path on the queue if its file name matches one of the keywords.
+        
+        Args:
+            path (str): The full path of the new file.
+            written (bool): True if the event shows the file is completely written (moved in or closed
+                after writing); False if it may still be being written (only just created).
+        """
+        if self.keyword_matcher(os.path.basename(path)):
+            self.file_queue.put((path, written))  # Hand the path over to the main loop for printing.
+
+    def on_created(self, event):
+        """
+        Queue newly created files that match the keywords, which may still be being written.
+        
+        When the observer reports files closed after writing, a created file is left until it is closed.
+        """
+        if not event.is_directory and not self.wait_for_close:
+            self.queue_if_matching(event.src_path, False)
+
+    def on_moved(self, event):
+        """Queue files renamed or moved into the folder that match the keywords, which are complete."""
+        if not event.is_directory and event.dest_path:  # A file moved out of the folder has no destination.
+            self.queue_if_matching(event.dest_path, True)
+
+    def on_closed(self, event):
+        """Queue files that match the keywords once they have been written and closed."""
+        if not event.is_directory:
+            self.queue_if_matching(event.src_path, True)
+
+class InotifyObserver:
+    """
+    Folder watcher built directly on Linux inotify, used in place of the watchdog observer when watchdog
+    is not installed.
+    
+    It has the start(), stop() and join() methods used on the watchdog observer, and reads events on
+    its own thread, passing the path of each file moved into or written and closed in the folder to
+    the handler's queue_if_matching(). Both events show the file is completely written.
+    """
+    def __init__(self, target_folder, handler):
+        """
+        Args:
+            target_folder (str): The folder to watch (not recursive).
+            handler (KeywordFileHandler): The handler that queues matching file paths for the main loop.
+        """
+        self.target_folder = target_folder  # The folder being watched.
+        self.handler = handler  # Queues the paths of new matching files.
+        self.stop_event = threading.Event()  # Set to stop the watcher thread.
+        self.thread = None  # The thread reading inotify events, once started.
+        self.fd = None  # The inotify file descriptor, once started.
 
-def check_printer_availability(printer_name):
+    def start(self):
+        """
+        Start watching the folder and reading its events on a background thread.
+        
+        Raises:
+            OSError: If the inotify instance or the watch could not be created (e.g. watch limits reached).
+        """
+        fd = inotify_init1(os.O_CLOEXEC)  # Create the inotify instance.
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        # Watch the folder for files being moved in, or closed after being written.
+        if inotify_add_watch(fd, os.fsencode(self.target_folder), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(error, os.strerror(error), self.target_folder)
+        self.fd = fd
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Read inotify events until stopped, queueing the path of every file they report."""
+        try:
+            while not self.stop_event.is_set():
+                # Wait for events, waking every second to check whether the watcher has been stopped.
+                readable, _, _ = select.select([self.fd], [], [], 1)
+                if not readable:
+                    continue
+                data = os.read(self.fd, 65536)  # Read all the pending events at once.
+                offset = 0
+                while offset < len(data):
+                    _, mask, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+                    offset += INOTIFY_EVENT.size
+                    name = data[offset:offset + name_length].rstrip(b'\0')  # The name is padded with null bytes.
+                    offset += name_length
+                    if name and not mask & IN_ISDIR:
+                        self.handler.queue_if_matching(os.path.join(self.target_folder, os.fsdecode(name)), True)
+        finally:
+            os.close(self.fd)  # Remove the watch by closing the inotify instance.
+
+    def stop(self):
+        """Ask the watcher thread to stop."""
+        self.stop_event.set()
+
+    def join(self):
+        """Wait for the watcher thread to finish."""
+        if self.thread is not None:
+            self.thread.join()
+
+def make_inotify_fds_non_inheritable():
     """
-    Check if the specified printer is available using the 'lpstat' command.
+    Mark every open inotify file descriptor as non-inheritable.
     
-    This function runs the 'lpstat -p <printer_name>' command to verify that the printer is active.
-    It logs the status and returns True if the printer is available, otherwise logs a warning and returns False.
+    watchdog creates its inotify instance without IN_CLOEXEC, so without this every command started by
+    run_command() would inherit it. The descriptors are found through /proc, which only exists on Linux,
+    the only platform where watchdog uses inotify.
+    """
+    try:
+        fds = os.listdir('/proc/self/fd')  # List the process's open file descriptors.
+    except OSError:
+        return  # Without /proc, watchdog is not using inotify.
+    for fd in fds:
+        try:
+            if os.readlink(f'/proc/self/fd/{fd}') == 'anon_inode:inotify':
+                os.set_inheritable(int(fd), False)
+        except OSError:
+            continue  # The descriptor was closed since the list was read (such as the one used to read it).
+
+def start_folder_observer(target_folder, keyword_matcher, file_queue):
+    """
+    Start a folder watcher that reports new matching files in the target folder.
+    
+    The watchdog observer is used when watchdog is installed; otherwise Linux inotify is used directly.
     
     Args:
-        printer_name (str): The name of the printer to check.
+        target_folder (str): The folder to watch (not recursive).
+        keyword_matcher (callable): The function from compile_keyword_matcher that new file names are checked with.
+        file_queue (queue.Queue): The queue that (path, written) pairs for matching files are placed on.
     
     Returns:
-        bool: True if the printer is available; False otherwise.
-    """
-    logger.pdebug(f"🔎 Checking printer: {printer_name} availability...")  # Log a debug message indicating printer check.
-    logger.ptrace(f"🛠️ TRACE: Running subprocess: lpstat -p {printer_name}")  # Log a trace message before executing the command.
-    # Execute the 'lpstat -p' command for the given printer, capturing the output and return code.
-    result = subprocess.run(['lpstat', '-p', printer_name], capture_output=True, text=True)
-    # Strip any extra whitespace from the output and split it to obtain a short version for logging.
-    short_status = result.stdout.strip().split('.')[0]
-    logger.ptrace(f"🛠️ TRACE: lpstat OK — {short_status}")  # Log the trace message with the short status.
-    if result.returncode == 0:
-        # If the command succeeded (return code 0), log a success message indicating printer availability.
-        logger.psuccess(f"✅ Printer {printer_name} waiting for files to print.")
-        # Return True to indicate that the printer is available.
-        return True
+        Observer, InotifyObserver or None: The running watcher, or None if the folder could not be watched.
+    """
+    logger.ptrace("🛠️ TRACE: Starting folder watcher on {}", target_folder)  # Log a trace message before starting the watcher.
+    if Observer is not None:
+        try:
+            # On Linux, have watchdog report a file moved in from outside the folder as moved rather than as
+            # created, so a created file can be left until it is reported closed after writing.
+            observer = Observer(generate_full_events=True)
+            wait_for_close = True
+        except TypeError:
+            # Other platforms' observers do not report files closed after writing, and do not take this option.
+            observer = Observer()  # Create an observer using the best available backend for this platform.
+            wait_for_close = False
+        handler = KeywordFileHandler(keyword_matcher, file_queue, wait_for_close)  # Queues new matching files.
+        try:
+            # Only ask for the events the handler acts on. With inotify this narrows the watch itself, so
+            # every write to an unrelated file in the folder no longer wakes the observer thread.
+            observer.schedule(
+                handler, target_folder, recursive=False,
+                event_filter=[FileMovedEvent, FileClosedEvent] + ([] if wait_for_close else [FileCreatedEvent]),
+            )
+        except TypeError:
+            # Versions of watchdog before 4.0 do not support event_filter, so receive every event.
+            observer.schedule(handler, target_folder, recursive=False)
     else:
-        # If the command did not succeed, log a warning message indicating the printer is not available.
-        logger.pwarning(f"⚠️ Printer {printer_name} is not available, retrying...")
-        # Return False to indicate that the printer is unavailable.
+        handler = KeywordFileHandler(keyword_matcher, file_queue)  # Queues new matching files for the main loop.
+        observer = InotifyObserver(target_folder, handler)  # Watch the folder with inotify directly.
+    try:
+        observer.start()  # Start the observer thread, which begins delivering events to the handler.
+    except OSError as e:
+        # If the folder cannot be watched (e.g. watch limits reached), log a warning and keep polling.
+        observer.stop()  # Stop any watcher threads that did start.
+        logger.pwarning(f"⚠️ Unable to watch {target_folder}: {e}. Polling instead.")
+        return None
+    if Observer is not None:
+        make_inotify_fds_non_inheritable()  # Keep watchdog's inotify descriptor out of the 'lp' and 'lpstat' processes.
+    logger.psuccess(f"👀 Watching {target_folder} for new files.")  # Log a success message once the watcher is running.
+    return observer
+
+def collect_queued_paths(file_queue, timeout):
+    """
+    Collect file paths reported by the folder watcher.
+    
+    Waits up to `timeout` seconds for the first path to arrive, then keeps taking paths for
+    PRINT_COALESCE_SECONDS so files arriving in a burst are collected together. With a timeout of
+    0, only the paths that are already waiting on the queue are taken, without blocking. None,
+    placed on the queue to wake the main loop after a failed print, ends the wait but is not returned.
+    
+    Args:
+        file_queue (queue.Queue): The queue that the folder watcher places (path, written) pairs on.
+        timeout (float): The maximum number of seconds to wait for the first path (0 to not wait).
+    
+    Returns:
+        list: The collected (path, written) pairs, possibly empty.
+    """
+    paths = []  # Initialize the list of collected paths.
+    try:
+        paths.append(file_queue.get(timeout=timeout))  # Wait for the first path, up to the timeout.
+        # Work out until when further paths are waited for, if at all.
+        coalesce_until = time.monotonic() + (PRINT_COALESCE_SECONDS if timeout else 0)
+        while True:
+            remaining = coalesce_until - time.monotonic()  # How much longer to wait for further paths.
+            if remaining > 0:
+                paths.append(file_queue.get(timeout=remaining))  # Wait briefly for further paths in the burst.
+            else:
+                paths.append(file_queue.get_nowait())  # Take any further paths that are already queued.
+    except queue.Empty:
+        pass  # The queue is empty, so everything available has been collected.
+    return [path for path in paths if path is not None]
+
+def wake_if_print_failed(file_queue, print_job):
+    """
+    Wake the main loop when a cycle's background print fails, so the failed files are retried
+    without waiting for the next file event or for EVENT_WAIT_SECONDS to pass.
+    
+    Added as a done callback to each print_files() future, so it runs on the print dispatcher thread.
+    
+    Args:
+        file_queue (queue.Queue): The queue the main loop waits on for files reported by the folder watcher.
+        print_job (concurrent.futures.Future): The finished print_files() future.
+    """
+    if print_job.cancelled():
+        return  # The print was cancelled at shutdown, so there is nothing to retry.
+    if print_job.exception() is not None or not print_job.result():
+        file_queue.put(None)  # Wake collect_queued_paths() without reporting a file.
+
+def get_cups_connection():
+    """
+    Return the current thread's pycups connection to the CUPS server, connecting on first use.
+    
+    Returns:
+        cups.Connection: The connection this thread uses to submit print jobs.
+    """
+    if getattr(_cups_connection, 'connection', None) is None:
+        logger.ptrace("🛠️ TRACE: Connecting to the CUPS server")  # Log a trace message before connecting.
+        _cups_connection.connection = cups.Connection()  # Open the connection (raises RuntimeError on failure).
+    return _cups_connection.connection
+
+def submit_cups_job(printer_name, files):
+    """
+    Submit one or more files to the printer as a single job over the pycups connection.
+    
+    Args:
+        printer_name (str): The name of the printer to print to.
+        files (list): (file name, full path) tuples for the files to print.
+    
+    Returns:
+        bool: True if CUPS accepted the job; False if it was rejected or the connection failed.
+    """
+    file_names = ', '.join(file for file, _ in files)  # Join the file names for the job title and log messages.
+    file_paths = [file_path for _, file_path in files]  # Collect the full paths of the files to print.
+    try:
+        # Submit all the files as one job, titled with their names.
+        job_id = get_cups_connection().printFiles(printer_name, file_paths, file_names, {})
+    except cups.IPPError as e:
+        # If CUPS rejected the job, log an error message with the reason.
+        logger.perror(f"❌ Print failure for {file_names}. Reason: {e}")
+        return False
+    except (cups.HTTPError, RuntimeError) as e:
+        # If CUPS could not be reached, log an error message with the reason.
+        logger.perror(f"❌ Print failure for {file_names}. Reason: {e}")
+        _cups_connection.connection = None  # Reconnect for the next job, as the connection may have been lost.
+        return False
+    except Exception as e:
+        # If an unexpected exception occurs (such as a file name pycups cannot encode), log an error message
+        # with the exception details, so one odd file does not stop the other files printing.
+        logger.perror(f"🚨 Exception encountered printing {file_names}: {e}")
+        return False
+    # Log a single trace message with the new job's id once it has been accepted.
+    logger.ptrace("🛠️ TRACE: CUPS job {} accepted: {} {}", job_id, printer_name, ' '.join(file_paths))
+    return True
+
+def submit_lp_job(printer_name, files):
+    """
+    Submit one or more files to the printer as a single job by running the 'lp' command.
+    
+    Args:
+        printer_name (str): The name of the printer to print to.
+        files (list): (file name, full path) tuples for the files to print.
+    
+    Returns:
+        bool: True if 'lp' accepted the job; False if it failed or raised an exception.
+    """
+    file_names = ', '.join(file for file, _ in files)  # Join the file names for log messages.
+    file_paths = [file_path for _, file_path in files]  # Collect the full paths to pass to lp.
+    try:
+        # Execute the 'lp' command to print the files, capturing output and errors.
+        print_result = run_command(['lp', '-d', printer_name, *file_paths])
+    except Exception as e:
+        # If an exception occurs during the print process, log an error message with the exception details.
+        logger.perror(f"🚨 Exception encountered printing {file_names}: {e}")
+        return False
+    # Log a single trace message with the command that was run, its return code and the first 80
+    # characters of its standard output and standard error.
+    logger.ptrace(
+        "🛠️ TRACE: lp call: lp -d {} {} → {}, stdout: {}, stderr: {}", printer_name, ' '.join(file_paths),
+        print_result.returncode, print_result.stdout.strip()[:80], print_result.stderr.strip()[:80],
+    )
+    if print_result.returncode != 0:
+        # If the print command failed (non-zero return code), log an error message with the stderr output.
+        logger.perror(f"❌ Print failure for {file_names}. Reason: {print_result.stderr}")
+        return False
+    return True
+
+def submit_print_job(printer_name, files, folder_fd=None):
+    """
+    Print one or more files as a single job and remove them once the job is accepted.
+    
+    The job is submitted over a pycups connection when pycups is installed, saving a process
+    and a new CUPS connection per job; otherwise it is submitted by running 'lp'.
+    
+    Args:
+        printer_name (str): The name of the printer to print to.
+        files (list): (file name, full path) tuples for the files to print.
+        folder_fd (int, optional): An open file descriptor for the folder holding the files. When given,
+            each file is removed by name relative to it instead of by resolving its full path.
+    
+    Returns:
+        bool: True if the job was accepted; False if it failed.
+    """
+    submit_job = submit_cups_job if cups is not None else submit_lp_job  # Choose how to submit the job.
+    if not submit_job(printer_name, files):
         return False
+    for file, file_path in files:
+        try:
+            if folder_fd is None:
+                os.remove(file_path)  # Remove the file after it has been printed successfully.
+            else:
+                os.unlink(file, dir_fd=folder_fd)  # Remove the file by name within the already open folder.
+        except OSError as e:
+            # The file has printed, so a failed removal is logged without treating the job as failed.
+            logger.perror(f"🚨 Printed {file}, but encountered an exception removing it: {e}")
+            continue
+        # The print job was accepted and the file removed, so log a single success message for the file.
+        logger.psuccess(f"✅ Printed: {file}. File removed.")
+    return True
+
+def print_files(printer_name, files, executor, folder_fd=None):
+    """
+    Print all matching files found in a cycle, using a single print job where possible.
+    
+    Files are submitted together in jobs of up to MAX_FILES_PER_PRINT_JOB files, saving a subprocess
+    and CUPS submission per file. If a job fails, each of its files is retried on its own so one bad
+    file does not stop the others printing. The jobs, and then the retries, are submitted on the
+    executor's worker threads so CUPS can accept several of them at once; this function waits for
+    all of them before returning. main() runs it on a background thread, so the folder is still
+    watched while the files print.
+    
+    Args:
+        printer_name (str): The name of the printer to print to.
+        files (list): (file name, full path) tuples for the files to print.
+        executor (ThreadPoolExecutor): The thread pool used to submit the print jobs.
+        folder_fd (int, optional): An open file descriptor for the folder holding the files, used to remove them.
+    
+    Returns:
+        bool: True if every file was printed; False if any file failed to print.
+    """
+    for file, _ in files:
+        # Log an informational message indicating that a matching file was found and will be printed.
+        logger.pinfo(f"📄 File found: {file}. Printing...")
+    # Split the files into jobs and submit them all, waiting for each result.
+    jobs = [files[start:start + MAX_FILES_PER_PRINT_JOB] for start in range(0, len(files), MAX_FILES_PER_PRINT_JOB)]
+    results = list(executor.map(functools.partial(submit_print_job, printer_name, folder_fd=folder_fd), jobs))
+    all_printed = True  # Set to False if any file fails to print.
+    retry_files = []  # Files from failed jobs of more than one file, to be retried one at a time.
+    for job_files, printed in zip(jobs, results):
+        if printed:
+            continue  # Every file in the job was printed.
+        if len(job_files) == 1:
+            all_printed = False  # There is nothing to retry separately.
+            continue
+        # Log a warning that the combined job failed and each file will be printed on its own.
+        logger.pwarning(f"⚠️ Printing {len(job_files)} files together failed, retrying each file separately.")
+        retry_files.extend(job_files)
+    # Print each file from the failed jobs separately, waiting for every attempt.
+    retry_results = list(executor.map(lambda file: submit_print_job(printer_name, [file], folder_fd), retry_files))
+    return all_printed and all(retry_results)
+
+def matching_folder_files(target_folder, keyword_matcher, ignored_entries):
+    """
+    Yield the files in the target folder whose names contain one of the keywords.
+    
+    The folder is read with scandir, which returns each entry's name, inode, full path and file type
+    in a single directory read, and matching files are yielded as they are read, so they can be
+    checked without first building a list of the whole folder. Entries already found not to match in
+    an earlier scan are skipped, so old files that sit in the folder are not checked again every scan.
+    The name is matched first, so is_file() (which needs a stat call on file systems that do not
+    report file types) only runs for the few entries that match a keyword. Symbolic links are not
+    followed, so a link never needs a stat call and the file it points to is never printed.
+    
+    Args:
+        target_folder (str): The folder to scan.
+        keyword_matcher (callable): The function from compile_keyword_matcher that file names are checked with.
+        ignored_entries (set): The (inode, name) of entries that did not match, updated with any new ones.
+    
+    Yields:
+        tuple: (file name, full path) for each matching file.
+    """
+    with os.scandir(target_folder) as entries:
+        for entry in entries:
+            entry_key = (entry.inode(), entry.name)
+            if entry_key in ignored_entries:
+                continue
+            if keyword_matcher(entry.name) and entry.is_file(follow_symlinks=False):
+                yield entry.name, entry.path
+            else:
+                ignored_entries.add(entry_key)  # Printed files are removed, so only skip entries left alone.
+
+def is_regular_file(path):
+    """
+    Check whether a path is a regular file, without following a symbolic link.
+    
+    This matches the check made on folder entries by matching_folder_files(), using a single lstat call.
+    
+    Args:
+        path (str): The full path to check.
+    
+    Returns:
+        bool: True if the path is a regular file; False if it is anything else or no longer exists.
+    """
+    try:
+        return stat.S_ISREG(os.lstat(path).st_mode)
+    except OSError:
+        return False  # The file was removed or renamed since it was reported.
+
+def split_settled_files(files, waiting_files, folder_fd=None):
+    """
+    Split matching files into those ready to print and those that may still be being written.
+    
+    A file the folder watcher reported as closed after writing, or as moved into the folder, is
+    complete and ready straight away. Any other file (found by a scan, or only reported as created)
+    counts as completely written once its size and modification time are unchanged since it was last
+    checked and it has not been modified for FILE_SETTLE_SECONDS, so a download or copy that is still
+    in progress is not printed (and then removed) half finished. Files that no longer exist, or that
+    have been replaced by anything other than a regular file (such as a symbolic link), are dropped.
+    
+    Args:
+        files (iterable): (file name, full path, written) tuples for the matching files, where written is
+            True if the folder watcher reported the file closed after writing or moved into the folder.
+        waiting_files (dict): The files still being written at the last check, as returned by the last call,
+            which are checked again.
+        folder_fd (int, optional): An open file descriptor for the folder holding the files. When given,
+            each file is looked up by name relative to it instead of by resolving its full path, so it
+            must still be the target folder (main() reopens it whenever the folder is replaced).
+    
+    Returns:
+        tuple: (settled, unsettled), where settled is a list of (file name, full path) tuples ready to print
+            and unsettled maps each (file name, full path) still being written to its (size, modification time).
+    """
+    settled = []  # Files that are ready to print.
+    unsettled = {}  # Files that may still be being written, with their size and modification time now.
+    # Check the files still being written last time again, and each file only once, counting it as
+    # completely written if any report of it says so.
+    candidates = dict.fromkeys(waiting_files, False)
+    for file, file_path, written in files:
+        candidates[file, file_path] = candidates.get((file, file_path), False) or written
+    now = time.time()  # Take the current time once for all the files.
+    for (file, file_path), written in candidates.items():
+        try:
+            if folder_fd is None:
+                file_stat = os.stat(file_path, follow_symlinks=False)  # Get the file's details, without following a link.
+            else:
+                # Get the file's details, looking it up by name within the already open folder.
+                file_stat = os.stat(file, dir_fd=folder_fd, follow_symlinks=False)
+        except OSError:
+            continue  # The file was removed or renamed since it was found.
+        if not stat.S_ISREG(file_stat.st_mode):
+            continue  # The file was replaced by a link, folder or other non-regular entry since it was found.
+        file_signature = (file_stat.st_size, file_stat.st_mtime_ns)  # Changes while the file is being written.
+        if written or (
+            waiting_files.get((file, file_path)) == file_signature and now - file_stat.st_mtime >= FILE_SETTLE_SECONDS
+        ):
+            settled.append((file, file_path))
+        else:
+            # Log a debug message indicating that the file will be checked again next cycle.
+            logger.pdebug("⏳ Waiting for {} to finish being written.", file)
+            unsettled[file, file_path] = file_signature
+    return settled, unsettled
+
+def next_retry_delay(retry_delay):
+    """
+    Return how long to wait before the next retry, doubling the previous wait.
+    
+    Args:
+        retry_delay (float): The previous wait in seconds, or 0 if the last attempt succeeded.
+    
+    Returns:
+        float: The next wait in seconds, between RETRY_MIN_SECONDS and RETRY_MAX_SECONDS.
+    """
+    return min(RETRY_MAX_SECONDS, max(RETRY_MIN_SECONDS, retry_delay * 2))
 
 def main():
     """
@@ -246,45 +1181,94 @@ def main():
     This function loads the configuration settings, enters an infinite loop to periodically scan
     a target folder for files matching specified keywords, and attempts to print any matching files
     using either the default printer or an explicitly specified printer. It includes error handling
-    for missing settings, printer issues, and folder access problems.
+    for missing settings, printer issues, and folder access problems. Changes to the settings file
+    are picked up at the start of the next cycle.
     """
     logger.pinfo("🔥 AUTO_PRINT service started 🚀")  # Log an informational message indicating that the service has started.
-    settings = load_settings()  # Load the configuration settings from the JSON file.
+    settings, _ = load_settings_if_changed()  # Get the settings loaded at startup, re-reading them only if the file has changed.
     if settings is None:
         # If settings could not be loaded, log a critical error message and exit the function.
         logger.pcritical("❌ Settings load failure at startup. Exiting.")
         return  # Exit the main function due to critical error.
 
     logger.pinfo("📥 Settings loaded successfully.")  # Log an informational message indicating successful settings load.
-    # Expand the target folder path; if not specified in settings, default to the user's Downloads folder.
-    target_folder = os.path.expanduser(settings.get('target_folder', '~/Downloads'))
-    # Retrieve the list of keywords from settings to search for in file names.
-    keywords = settings.get('keywords', [])
-    # Determine whether to use the system's default printer based on settings.
-    use_default_printer = settings.get('use_default_printer', True)
-    # Retrieve the explicit printer name from settings if provided.
-    explicit_printer_name = settings.get('explicit_printer_name', None)
-    # Get the scan interval (in seconds) from settings to determine how frequently to scan the folder.
-    scan_interval = settings.get('scan_interval_seconds', 3)
 
     cycle_count = 0  # Initialize a counter to keep track of the number of monitoring cycles.
     prev_printer_name = None  # Initialize a variable to track the previously used printer name for logging.
+    ready_printer = None  # The printer last found available, used to log when a printer becomes available.
+    file_queue = queue.Queue()  # Queue of matching file paths reported by the folder watcher thread.
+    observer = None  # The folder watcher, started once the target folder is accessible.
+    watch_failed_at = None  # The monotonic time the folder watcher last failed to start, or None if it has not.
+    queued_paths = []  # File paths reported by the folder watcher that have not been printed yet.
+    rescan_folder = True  # Scan the whole folder on the first cycle to pick up files that are already there.
+    print_executor = ThreadPoolExecutor(max_workers=PRINT_WORKERS)  # Worker threads that submit the print jobs.
+    # A single thread that prints each cycle's files in the background (handing the jobs to print_executor),
+    # so the main loop goes straight back to watching the folder instead of waiting for CUPS.
+    print_dispatcher = ThreadPoolExecutor(max_workers=1)
+    print_jobs = {}  # The full paths of the files being printed by each cycle's print_files() future.
+    printing_paths = set()  # The full paths of every file still being printed, so none is printed twice.
+    folder_fd = None  # An open file descriptor for the target folder, used to remove printed files by name.
+    retry_delay = 0  # How long the last wait before a retry was, or 0 if the last cycle had no problems.
+    last_scan_at = 0.0  # The monotonic time the whole folder was last scanned.
+    last_folder_mtime_ns = None  # The folder's modification time at the last scan, if it can be trusted.
+    waiting_files = {}  # Matching files that may still be being written, with their size and modification time.
+    ignored_entries = set()  # The (inode, name) of folder entries that did not match, skipped by later scans.
+    ignored_entries_reset_at = 0.0  # The monotonic time ignored_entries was last cleared.
+    idle_sleep = 0  # The last wait between polls while the folder was idle, or 0 if the last cycle found files.
 
     try:
         # Start an infinite loop to continuously monitor the target folder.
         while True:
             cycle_count += 1  # Increment the cycle counter at the beginning of each cycle.
-            logger.pdebug(f"🔄 Starting cycle {cycle_count}")  # Log a debug message indicating the start of a new cycle.
-            logger.ptrace(f"🛠️ TRACE: Cycle {cycle_count} start acknowledged")  # Log a trace message for cycle start.
+            logger.pdebug("🔄 Starting cycle {}", cycle_count)  # Log a debug message indicating the start of a new cycle.
+            logger.ptrace("🛠️ TRACE: Cycle {} start acknowledged", cycle_count)  # Log a trace message for cycle start.
+
+            # Reload the settings if the settings file has been modified since it was last loaded.
+            settings, settings_changed = load_settings_if_changed()
+            if settings_changed and cycle_count > 1:
+                # Log an informational message indicating that changed settings are being applied.
+                logger.pinfo("🔁 Settings file changed. Applying new settings.")
+                if observer is not None:
+                    observer.stop()  # Stop the folder watcher so it is restarted with the new settings.
+                    observer.join()  # Wait for the folder watcher thread to finish.
+                    observer = None
+                watch_failed_at = None  # Try watching the folder again straight away with the new settings.
+                if folder_fd is not None:
+                    wait(print_jobs)  # Let the files still being printed be removed through the old folder first.
+                    os.close(folder_fd)  # Close the old folder so the target folder is opened again.
+                    folder_fd = None
+                rescan_folder = True  # Scan the whole folder with the new settings.
+                waiting_files = {}  # The new scan will find any of these files that still match.
+                last_folder_mtime_ns = None  # The keywords may have changed, so the scan cannot be skipped.
+                ignored_entries.clear()  # Entries that did not match the old keywords may match the new ones.
+                idle_sleep = 0  # Poll at the configured scan interval again with the new settings.
+            if settings_changed or cycle_count == 1:
+                # Expand the target folder path; if not specified in settings, default to the user's Downloads folder.
+                target_folder = os.path.expanduser(settings.target_folder)
+                # Retrieve the list of keywords from settings to search for in file names.
+                keywords = settings.keywords
+                # Build the case-insensitive keyword check used on file names once, when the settings change.
+                keyword_matcher = compile_keyword_matcher(keywords)
+                # Determine whether to use the system's default printer based on settings.
+                use_default_printer = settings.use_default_printer
+                # Retrieve the explicit printer name from settings if provided.
+                explicit_printer_name = settings.explicit_printer_name
+                # Get the scan interval (in seconds) from settings to determine how frequently to scan the folder.
+                scan_interval = settings.scan_interval_seconds
+
+            # Get the default printer and the available printers with a single printer check.
+            default_printer, available_printers = probe_cups()
 
             # Determine which printer to use based on the configuration setting.
             if use_default_printer:
-                # Retrieve the default printer name using the get_default_printer() function.
-                current_printer = get_default_printer()
+                # Use the default printer reported by CUPS.
+                current_printer = default_printer
                 if not current_printer:
-                    # If no default printer is detected, log a critical error and wait 10 seconds before retrying.
-                    logger.pcritical("❌ Default printer not found. Retrying in 10 seconds...")
-                    time.sleep(10)  # Pause execution for 10 seconds.
+                    # If no default printer is detected, log a critical error and wait before retrying.
+                    retry_delay = next_retry_delay(retry_delay)
+                    logger.pcritical(f"❌ Default printer not found. Retrying in {retry_delay:g} seconds...")
+                    invalidate_printer_cache()  # Check the printers again on the retry rather than reusing this result.
+                    time.sleep(retry_delay)  # Pause execution before retrying.
                     continue  # Skip the rest of the loop and start the next cycle.
                 # If the detected default printer has changed from the previous cycle, log the change.
                 if prev_printer_name != current_printer:
@@ -295,9 +1279,10 @@ def main():
             else:
                 # If not using the default printer, check for an explicitly specified printer name.
                 if not explicit_printer_name:
-                    # If no explicit printer name is provided, log an error and wait 10 seconds before retrying.
-                    logger.perror("🚫 No explicit printer name configured. Retrying in 10 seconds...")
-                    time.sleep(10)  # Pause execution for 10 seconds.
+                    # If no explicit printer name is provided, log an error and wait before retrying.
+                    retry_delay = next_retry_delay(retry_delay)
+                    logger.perror(f"🚫 No explicit printer name configured. Retrying in {retry_delay:g} seconds...")
+                    time.sleep(retry_delay)  # Pause execution before retrying.
                     continue  # Skip the rest of the loop and start the next cycle.
                 # If the explicit printer name has changed from the previous cycle, log the change.
                 if prev_printer_name != explicit_printer_name:
@@ -307,75 +1292,197 @@ def main():
                 printer_name = explicit_printer_name
 
             # Check if the chosen printer is currently available.
-            if not check_printer_availability(printer_name):
-                time.sleep(10)  # Pause execution for 10 seconds before rechecking if the printer is unavailable.
+            if printer_name not in available_printers:
+                # If the printer is not available, log a warning message.
+                retry_delay = next_retry_delay(retry_delay)
+                logger.pwarning(f"⚠️ Printer {printer_name} is not available, retrying in {retry_delay:g} seconds...")
+                ready_printer = None  # Log again once the printer becomes available.
+                invalidate_printer_cache()  # Check the printers again on the retry rather than reusing this result.
+                time.sleep(retry_delay)  # Pause execution before rechecking if the printer is unavailable.
                 continue  # Skip the rest of the loop and start the next cycle.
+            if ready_printer != printer_name:
+                # Log a success message when the printer becomes available.
+                logger.psuccess(f"✅ Printer {printer_name} waiting for files to print.")
+                ready_printer = printer_name  # Update the printer last found available.
 
             # Check if the target folder exists and is accessible for reading.
-            if not os.path.exists(target_folder) or not os.access(target_folder, os.R_OK):
+            # os.access also fails for a folder that does not exist, so one call covers both checks.
+            if not os.access(target_folder, os.R_OK):
                 # If the folder does not exist or is not readable, log a critical error.
-                logger.pcritical(f"🚫 Folder access issue: {target_folder}. Retrying in 10s.")
-                time.sleep(10)  # Pause execution for 10 seconds before retrying.
+                retry_delay = next_retry_delay(retry_delay)
+                logger.pcritical(f"🚫 Folder access issue: {target_folder}. Retrying in {retry_delay:g}s.")
+                if folder_fd is not None:
+                    wait(print_jobs)  # Let the files still being printed be removed through the folder first.
+                    os.close(folder_fd)  # Close the folder so it is opened again once it is accessible.
+                    folder_fd = None
+                time.sleep(retry_delay)  # Pause execution before retrying.
                 continue  # Skip the rest of the loop and start the next cycle.
             else:
                 # Log a debug message confirming that the target folder is accessible.
-                logger.pdebug(f"📂 Folder access check passed: {target_folder}")
-
-            # Log an informational message about scanning the target folder for the specified number of keywords.
-            logger.pinfo(f"🔎 Scanning {target_folder} for {len(keywords)} keywords.")
-            logger.ptrace(f"🛠️ TRACE: Searching for {len(keywords)} keywords...")  # Log a trace message for scanning.
-
-            files_found = False  # Initialize a flag to indicate whether any matching files are found during this cycle.
-            # Iterate over each file in the target folder.
-            for file in os.listdir(target_folder):
-                # Check if any keyword (case-insensitive) exists within the current file name.
-                if any(keyword.lower() in file.lower() for keyword in keywords):
-                    # Construct the full path of the file by joining the target folder path with the file name.
-                    file_path = os.path.join(target_folder, file)
-                    # Log an informational message indicating that a matching file was found and will be printed.
-                    logger.pinfo(f"📄 File found: {file}. Printing...")
-                    # Log a trace message indicating the command that will be executed to print the file.
-                    logger.ptrace(f"🛠️ TRACE: lp call: lp -d {printer_name} {file_path}")
-                    files_found = True  # Set the flag to True as a matching file has been found.
-                    try:
-                        # Execute the 'lp' command using subprocess.run to print the file, capturing output and errors.
-                        print_result = subprocess.run(
-                            ['lp', '-d', printer_name, file_path],
-                            capture_output=True,
-                            text=True
-                        )
-                        # Log a trace message showing the first 80 characters of the command's standard output.
-                        logger.ptrace(f"🛠️ TRACE: lp stdout: {print_result.stdout.strip()[:80]}...")
-                        # Log a trace message showing the first 80 characters of the command's standard error.
-                        logger.ptrace(f"🛠️ TRACE: lp stderr: {print_result.stderr.strip()[:80]}...")
-                        if print_result.returncode == 0:
-                            # If the print command was successful (return code 0), log a success message.
-                            logger.psuccess(f"✅ Printed: {file}. File removed.")
-                            os.remove(file_path)  # Remove the file after it has been printed successfully.
-                            # Log a trace message indicating that the file has been deleted.
-                            logger.ptrace(f"🛠️ TRACE: Deleted {file} post-print.")
-                        else:
-                            # If the print command failed (non-zero return code), log an error message with the stderr output.
-                            logger.perror(f"❌ Print failure for {file}. Reason: {print_result.stderr}")
-                    except Exception as e:
-                        # If an exception occurs during the print process, log an error message with the exception details.
-                        logger.perror(f"🚨 Exception encountered printing {file}: {e}")
+                logger.pdebug("📂 Folder access check passed: {}", target_folder)
+                retry_delay = 0  # The printer and folder are fine, so the next problem starts with the shortest wait.
+
+            # Get the target folder's details once per cycle, to check the open folder and skip unchanged scans.
+            folder_stat = os.stat(target_folder)
+            if folder_fd is not None:
+                open_folder_stat = os.fstat(folder_fd)  # Get the details of the folder that is open.
+                if (open_folder_stat.st_dev, open_folder_stat.st_ino) != (folder_stat.st_dev, folder_stat.st_ino):
+                    # The folder was renamed away or replaced since it was opened, so a file looked up by name
+                    # in the open folder would be the old folder's file. Log a warning and open it again.
+                    logger.pwarning(f"⚠️ {target_folder} was replaced since it was opened. Opening it again.")
+                    wait(print_jobs)  # Let the files found in the old folder be removed from it first.
+                    os.close(folder_fd)  # Close the old folder so the target folder is opened again below.
+                    folder_fd = None
+                    if observer is not None:
+                        observer.stop()  # Stop watching the old folder so the new one is watched instead.
+                        observer.join()  # Wait for the folder watcher thread to finish.
+                        observer = None
+                    rescan_folder = True  # Scan the new folder in full.
+                    waiting_files = {}  # The new scan will find any of these files that are in the new folder.
+                    last_folder_mtime_ns = None  # The modification time was the old folder's.
+                    ignored_entries.clear()  # The ignored entries were the old folder's.
+
+            # Open the target folder once, so files can be checked and removed without resolving their full paths.
+            if folder_fd is None and {os.stat, os.unlink} <= os.supports_dir_fd:
+                try:
+                    folder_fd = os.open(target_folder, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+                except OSError as e:
+                    # If the folder cannot be opened, log a trace message and keep removing files by full path.
+                    logger.ptrace("🛠️ TRACE: Unable to open {}: {}", target_folder, e)
+
+            # Start watching the folder for new files once it is accessible, if it can be watched. After a failed
+            # start, only try again as often as the folder is swept, rather than logging a warning every cycle.
+            if observer is None and (Observer is not None or inotify_init1 is not None) and (
+                watch_failed_at is None or time.monotonic() - watch_failed_at >= FOLDER_SWEEP_SECONDS
+            ):
+                observer = start_folder_observer(target_folder, keyword_matcher, file_queue)
+                watch_failed_at = time.monotonic() if observer is None else None
+
+            # Check the files printed in the background since the last cycle.
+            for print_job in [print_job for print_job in print_jobs if print_job.done()]:
+                printing_paths.difference_update(print_jobs.pop(print_job))  # These files can be found again.
+                try:
+                    printed = print_job.result()  # Whether every file in the cycle's jobs was printed.
+                except Exception as e:
+                    # If printing raised an unexpected exception, log an error and treat it as a failed print.
+                    logger.perror(f"🚨 Exception encountered printing files: {e}")
+                    printed = False
+                if not printed:
+                    rescan_folder = True  # Rescan the folder so the failed files are retried.
+                    last_folder_mtime_ns = None  # The failed files are still there, so the scan must not be skipped.
+                    invalidate_printer_cache()  # Re-check the printer rather than trusting the cache.
+
+            # Scan the whole folder now and then even while it is watched, in case any events were missed.
+            if time.monotonic() - last_scan_at >= FOLDER_SWEEP_SECONDS:
+                rescan_folder = True
+
+            scan_folder = observer is None or rescan_folder  # Without a folder watcher, or when files may have been missed.
+            if scan_folder:
+                # Get the folder's modification time, which changes whenever an entry is added, removed or renamed.
+                folder_mtime_ns = folder_stat.st_mtime_ns
+                if folder_mtime_ns == last_folder_mtime_ns:
+                    # Nothing has been added to the folder since the last scan, so skip listing it again.
+                    logger.ptrace("🛠️ TRACE: Folder unchanged since the last scan, skipping scan")
+                    scan_folder = False
+                    rescan_folder = False  # The folder is still up to date.
+                    last_scan_at = time.monotonic()  # Count this as a scan for the periodic sweep.
+
+            if scan_folder:
+                # Scan the whole folder.
+                # Log an informational message about scanning the target folder for the specified number of keywords.
+                logger.pinfo(f"🔎 Scanning {target_folder} for {len(keywords)} keywords.")
+                logger.ptrace("🛠️ TRACE: Searching for {} keywords...", len(keywords))  # Log a trace message for scanning.
+                # Discard paths already reported by the watcher before listing, as the scan will cover them,
+                # but remember which of the files they reported as completely written.
+                queued_paths.extend(collect_queued_paths(file_queue, 0))
+                written_paths = {path for path, written in queued_paths if written}
+                queued_paths.clear()
+                if time.monotonic() - ignored_entries_reset_at >= IGNORED_ENTRIES_RESET_SECONDS:
+                    # Clear the ignored entries now and then, so entries removed from the folder are forgotten.
+                    ignored_entries.clear()
+                    ignored_entries_reset_at = time.monotonic()
+                # Find the files whose names contain any keyword (case-insensitive). The folder is read
+                # as the files are checked below, rather than listed in full first.
+                found_files = (
+                    (file, file_path, file_path in written_paths)
+                    for file, file_path in matching_folder_files(target_folder, keyword_matcher, ignored_entries)
+                )
+                rescan_folder = False  # The folder is up to date; rely on the watcher until the next sweep or a failed print.
+                last_scan_at = time.monotonic()  # Record when the folder was scanned.
+                # Remember the folder's modification time, unless it is too recent to be sure it will change
+                # when the next file is added.
+                if time.time() - folder_mtime_ns / 1e9 >= FOLDER_MTIME_SETTLE_SECONDS:
+                    last_folder_mtime_ns = folder_mtime_ns
+                else:
+                    last_folder_mtime_ns = None
+            else:
+                # Take any paths reported since the last cycle without waiting.
+                queued_paths.extend(collect_queued_paths(file_queue, 0))
+                logger.ptrace("🛠️ TRACE: {} file(s) reported by the folder watcher", len(queued_paths))
+                # Keep the files in the order they were reported, skipping repeated events for the same file
+                # and files that were removed or renamed again since they were reported.
+                found_files = [
+                    (os.path.basename(path), path, written)
+                    for path, written in dict.fromkeys(queued_paths) if is_regular_file(path)
+                ]
+                queued_paths.clear()  # The reported paths are handled in this cycle.
+
+            # Skip the files that are already being printed in the background.
+            found_files = [
+                (file, file_path, written) for file, file_path, written in found_files if file_path not in printing_paths
+            ]
+            # Check the files still being written last cycle again, and hold back any file still being written now.
+            files_to_print, waiting_files = split_settled_files(found_files, waiting_files, folder_fd)
+
+            files_found = bool(files_to_print or waiting_files)  # Set the flag to True if any matching files were found.
+            if files_to_print:
+                # Print the files in the background; the result is checked at the start of a later cycle.
+                print_job = print_dispatcher.submit(print_files, printer_name, files_to_print, print_executor, folder_fd)
+                print_jobs[print_job] = [file_path for _, file_path in files_to_print]
+                printing_paths.update(print_jobs[print_job])
+                # Wake the main loop if the print fails, so the failed files are retried straight away.
+                print_job.add_done_callback(functools.partial(wake_if_print_failed, file_queue))
 
             if not files_found:
                 # If no matching files were found during this cycle, log an informational message.
                 logger.pinfo(f"ℹ️ No files found to print this cycle (cycle {cycle_count}).")
                 # Log a trace message to indicate that the cycle completed without printing any files.
-                logger.ptrace(f"💓 TRACE: Cycle {cycle_count} idle heartbeat.")
+                logger.ptrace("💓 TRACE: Cycle {} idle heartbeat.", cycle_count)
 
-            # Log a debug message indicating that the cycle is complete and the script will sleep before the next cycle.
-            logger.pdebug(f"⏳ Cycle {cycle_count} complete. Sleeping for {scan_interval} seconds... 💤")
-            # Log a trace message with details about the sleep duration and upcoming cycle.
-            logger.ptrace(f"🛠️ TRACE: Sleeping for {scan_interval}s; next cycle {cycle_count + 1}")
-            time.sleep(scan_interval)  # Pause execution for the specified scan interval before starting the next cycle.
+            if observer is None:
+                # Poll an idle folder less often: double the wait after each cycle in a row without files, up to
+                # MAX_IDLE_SCAN_INTERVAL_SECONDS, and go back to the configured scan interval once files are found.
+                longest_sleep = max(scan_interval, MAX_IDLE_SCAN_INTERVAL_SECONDS)  # Never below the configured interval.
+                if files_found or not idle_sleep:
+                    sleep_for = scan_interval  # Start from the configured scan interval.
+                else:
+                    sleep_for = min(idle_sleep * 2, longest_sleep)  # Double the last wait, stopping at the cap.
+                idle_sleep = 0 if files_found else sleep_for
+                # Log a debug message indicating that the cycle is complete and the script will sleep before the next cycle.
+                logger.pdebug("⏳ Cycle {} complete. Sleeping for {:g} seconds... 💤", cycle_count, sleep_for)
+                # Log a trace message with details about the sleep duration and upcoming cycle.
+                logger.ptrace("🛠️ TRACE: Sleeping for {:g}s; next cycle {}", sleep_for, cycle_count + 1)
+                time.sleep(sleep_for)  # Pause execution before starting the next cycle.
+            else:
+                # Wait for new files, but only briefly if files still being written need to be checked again.
+                event_wait = FILE_SETTLE_SECONDS if waiting_files else EVENT_WAIT_SECONDS
+                # Log a debug message indicating that the cycle is complete and the script will wait for new files.
+                logger.pdebug("⏳ Cycle {} complete. Waiting up to {} seconds for new files... 💤", cycle_count, event_wait)
+                # Wait until the folder watcher reports a matching file, or the timeout passes so the printer is re-checked.
+                queued_paths.extend(collect_queued_paths(file_queue, event_wait))
 
     except KeyboardInterrupt:
         # Catch a KeyboardInterrupt (e.g., when the user presses Ctrl+C) to allow for graceful shutdown.
         logger.pinfo("👋 Shutdown request received. Exiting cleanly.")
+        if observer is not None:
+            observer.stop()  # Stop the folder watcher thread.
+            observer.join()  # Wait for the folder watcher thread to finish.
+        # Let print jobs that are already being submitted finish, so their files are still removed.
+        print_dispatcher.shutdown(cancel_futures=True)
+        print_executor.shutdown(cancel_futures=True)
+        _printer_refresh_executor.shutdown(cancel_futures=True)  # Let any printer status refresh finish.
+        if folder_fd is not None:
+            os.close(folder_fd)  # Close the target folder now that no print jobs are using it.
         sys.exit(0)  # Exit the program with a status code of 0 indicating a clean shutdown.
 
 # This conditional ensures that main() is only called when this script is executed directly,